@@ -5,11 +5,14 @@ Application Factoryパターンを使用してFlaskアプリケーションを
 """
 
 import locale
+import sqlite3
 from flask import Flask
 from flask_sqlalchemy import SQLAlchemy
 from flask_migrate import Migrate
 from flask_login import LoginManager
 from flask_wtf.csrf import CSRFProtect
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
 import os
 from config import config  # config.pyから設定辞書をインポート
 
@@ -20,6 +23,20 @@ login_manager = LoginManager()
 csrf = CSRFProtect()
 
 
+@event.listens_for(Engine, "connect")
+def set_sqlite_pragma(dbapi_connection, connection_record):
+    """
+    SQLite接続時にPRAGMAを設定する
+
+    WALモードとsynchronous=NORMALにより、コミットごとのfsyncを減らす。
+    """
+    if isinstance(dbapi_connection, sqlite3.Connection):
+        cursor = dbapi_connection.cursor()
+        cursor.execute("PRAGMA journal_mode=WAL")
+        cursor.execute("PRAGMA synchronous=NORMAL")
+        cursor.close()
+
+
 def create_app(config_name: str = "default") -> Flask:
     """
     Flaskアプリケーションを作成する（Application Factoryパターン）
@@ -33,6 +50,11 @@ def create_app(config_name: str = "default") -> Flask:
     """
     app = Flask(__name__, instance_relative_config=True)
 
+    # JSONレスポンスのシリアライズにorjsonを使用する
+    from app.utils.json_provider import OrjsonProvider
+
+    app.json = OrjsonProvider(app)
+
     # config.pyから設定を読み込む
     app.config.from_object(config[config_name])
     app.config["SECRET_KEY"] = os.environ.get(
@@ -61,16 +83,12 @@ def create_app(config_name: str = "default") -> Flask:
     except OSError:
         pass
 
-    # Blueprintの登録
-    from app.routes import upload
-
-    app.register_blueprint(upload.upload_bp)
-
     # 拡張機能の初期化
     db.init_app(app)
     migrate.init_app(app, db)
 
     # 循環インポートを避けるため、関数内でインポートします
+    # （modelsパッケージの読み込みで全モデルがFlask-Migrateに登録される）
     from . import models
     from .reservation import reservation_bp
     from .program import program_bp
@@ -98,17 +116,7 @@ def create_app(config_name: str = "default") -> Flask:
         """ユーザーIDからユーザーオブジェクトを取得する"""
         from app.models import User
 
-        return User.query.get(int(user_id))
-
-    # データベースモデルのインポート（循環インポートを避けるため）
-    from app.models import (
-        pos_sales,
-        daily_sales,
-        user,
-        settlement_history,
-        program,
-        reservation,
-    )  # noqa: F401
+        return db.session.get(User, int(user_id))
 
     # 機能Blueprintの登録
     from app.features import register_features
@@ -29,13 +29,22 @@ def seed_command():
         },
     ]
 
+    # 同じ名前のプログラムが既に存在しないかを1回のクエリで確認
+    existing_names = set(
+        db.session.scalars(
+            db.select(ExperienceProgram.name).where(
+                ExperienceProgram.name.in_([program_data["name"] for program_data in programs_to_seed])
+            )
+        )
+    )
+
+    new_programs = []
     for program_data in programs_to_seed:
-        # 同じ名前のプログラムが既に存在しないか確認
-        if not ExperienceProgram.query.filter_by(name=program_data["name"]).first():
-            program = ExperienceProgram(**program_data)
-            db.session.add(program)
-            click.echo(f"プログラム '{program.name}' を作成しました。")
+        if program_data["name"] not in existing_names:
+            new_programs.append(ExperienceProgram(**program_data))
+            click.echo(f"プログラム '{program_data['name']}' を作成しました。")
 
+    db.session.add_all(new_programs)
     db.session.commit()
     click.echo("データベースの初期データ投入が完了しました。")
 
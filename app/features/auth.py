@@ -10,6 +10,7 @@ from werkzeug.security import check_password_hash, generate_password_hash
 from app import db
 from app.models import User
 from app.forms.auth import LoginForm, RegisterForm, ResetPasswordForm
+from app.features.user_management import invalidate_user_list_cache
 
 auth_bp = Blueprint("auth", __name__, url_prefix="/auth")
 
@@ -65,6 +66,7 @@ def register():
 
             db.session.add(user)
             db.session.commit()
+            invalidate_user_list_cache()
 
             flash("アカウントの登録が完了しました。ログインしてください。", "success")
             return redirect(url_for("auth.login"))
@@ -87,8 +89,8 @@ def reset_password():
     form = ResetPasswordForm()
 
     if form.validate_on_submit():
-        # ユーザー名とメールアドレスでユーザーを検索
-        user = User.query.filter_by(username=form.username.data, email=form.email.data).first()
+        # フォームの検証時にユーザー名とメールアドレスで特定したユーザー
+        user = db.session.get(User, form.user_id) if form.user_id is not None else None
 
         if user:
             try:
@@ -6,6 +6,7 @@
 
 import os
 import re
+import tempfile
 from datetime import datetime
 from flask import (
     Blueprint,
@@ -21,11 +22,14 @@ from flask import (
 from flask_login import login_required
 from werkzeug.utils import secure_filename
 from app.utils.decorators import shinko_center_required
+from app.utils.file_cleanup import schedule_removal
 from app.utils.zengin import ZenginConverter, ZenginFormatError
 
 bank_format_bp = Blueprint("bank_format", __name__, url_prefix="/bank-format")
 
 ALLOWED_EXTENSIONS = {"xlsx", "xls"}
+# 全銀ファイル名（zengin_YYYYMMDD_HHMMSS.txt形式）のパターン
+ZENGIN_FILENAME_PATTERN = re.compile(r"zengin_(\d{8})_(\d{6})\.txt")
 
 
 def allowed_file(filename: str) -> bool:
@@ -44,9 +48,7 @@ def extract_datetime_from_filename(filename: str, output_dir: str = None) -> dat
     Returns:
         抽出された日時（datetimeオブジェクト）、抽出できない場合はファイルの作成日時
     """
-    # zengin_YYYYMMDD_HHMMSS.txt形式のパターン
-    pattern = r"zengin_(\d{8})_(\d{6})\.txt"
-    match = re.match(pattern, filename)
+    match = ZENGIN_FILENAME_PATTERN.match(filename)
 
     if match:
         date_str = match.group(1)  # YYYYMMDD
@@ -281,8 +283,10 @@ def convert():
                 os.makedirs(upload_dir, exist_ok=True)
 
                 # 一時ファイルとして保存
-                excel_path = os.path.join(upload_dir, filename)
-                file.save(excel_path)
+                # （同名のファイルが同時にアップロードされても、変換中のファイルを上書き・削除しないよう一意な名前にする）
+                with tempfile.NamedTemporaryFile(dir=upload_dir, suffix=f"_{filename}", delete=False) as f:
+                    file.save(f)
+                excel_path = f.name
                 uploaded_file = excel_path
                 current_app.logger.info(f"アップロードされたファイルを保存: {excel_path}")
 
@@ -348,13 +352,8 @@ def convert():
             error_msg = str(e)
             flash(f"変換エラー: {error_msg}", "error")
             current_app.logger.error(f"変換エラー: {error_msg}")
-            # アップロードされた一時ファイルを削除
-            if uploaded_file and os.path.exists(uploaded_file):
-                try:
-                    os.remove(uploaded_file)
-                    current_app.logger.info(f"一時ファイルを削除: {uploaded_file}")
-                except Exception as del_e:
-                    current_app.logger.warning(f"一時ファイルの削除に失敗: {uploaded_file}, {str(del_e)}")
+            # アップロードされた一時ファイルを削除（バックグラウンドで実行）
+            schedule_removal(uploaded_file)
             return redirect(url_for("bank_format.index"))
         except Exception as e:
             import traceback
@@ -363,13 +362,8 @@ def convert():
             error_msg = f"変換処理中にエラーが発生しました: {str(e)}"
             flash(error_msg, "error")
             current_app.logger.error(f"{error_msg}\n{error_detail}")
-            # アップロードされた一時ファイルを削除
-            if uploaded_file and os.path.exists(uploaded_file):
-                try:
-                    os.remove(uploaded_file)
-                    current_app.logger.info(f"一時ファイルを削除: {uploaded_file}")
-                except Exception as del_e:
-                    current_app.logger.warning(f"一時ファイルの削除に失敗: {uploaded_file}, {str(del_e)}")
+            # アップロードされた一時ファイルを削除（バックグラウンドで実行）
+            schedule_removal(uploaded_file)
             return redirect(url_for("bank_format.index"))
 
         # エンコーディングと改行コードの設定を取得（デフォルト: Shift-JIS, CRLF）
@@ -397,13 +391,8 @@ def convert():
             flash(f"全銀フォーマットファイルを保存しました: {output_filename}", "success")
             current_app.logger.info(f"保存ファイル: {output_filename}")
 
-            # アップロードされた一時ファイルを削除
-            if uploaded_file and os.path.exists(uploaded_file):
-                try:
-                    os.remove(uploaded_file)
-                    current_app.logger.info(f"一時ファイルを削除: {uploaded_file}")
-                except Exception as e:
-                    current_app.logger.warning(f"一時ファイルの削除に失敗: {uploaded_file}, {str(e)}")
+            # アップロードされた一時ファイルを削除（バックグラウンドで実行）
+            schedule_removal(uploaded_file)
 
             # トップページにリダイレクト（成功メッセージとダウンロードリンクを表示）
             return redirect(url_for("bank_format.index"))
@@ -412,13 +401,8 @@ def convert():
             error_msg = f"ファイル保存エラー: {str(e)}"
             flash(error_msg, "error")
             current_app.logger.error(error_msg)
-            # アップロードされた一時ファイルを削除
-            if uploaded_file and os.path.exists(uploaded_file):
-                try:
-                    os.remove(uploaded_file)
-                    current_app.logger.info(f"一時ファイルを削除: {uploaded_file}")
-                except Exception as del_e:
-                    current_app.logger.warning(f"一時ファイルの削除に失敗: {uploaded_file}, {str(del_e)}")
+            # アップロードされた一時ファイルを削除（バックグラウンドで実行）
+            schedule_removal(uploaded_file)
             return redirect(url_for("bank_format.index"))
         except Exception as e:
             import traceback
@@ -427,13 +411,8 @@ def convert():
             error_msg = f"ファイル保存中にエラーが発生しました: {str(e)}"
             flash(error_msg, "error")
             current_app.logger.error(f"{error_msg}\n{error_detail}")
-            # アップロードされた一時ファイルを削除
-            if uploaded_file and os.path.exists(uploaded_file):
-                try:
-                    os.remove(uploaded_file)
-                    current_app.logger.info(f"一時ファイルを削除: {uploaded_file}")
-                except Exception as del_e:
-                    current_app.logger.warning(f"一時ファイルの削除に失敗: {uploaded_file}, {str(del_e)}")
+            # アップロードされた一時ファイルを削除（バックグラウンドで実行）
+            schedule_removal(uploaded_file)
             return redirect(url_for("bank_format.index"))
 
     except Exception as e:
@@ -442,11 +421,7 @@ def convert():
         error_detail = traceback.format_exc()
         current_app.logger.error(f"変換処理エラー: {str(e)}\n{error_detail}")
         flash(f"予期しないエラーが発生しました: {str(e)}", "error")
-        # アップロードされた一時ファイルを削除
-        if "uploaded_file" in locals() and uploaded_file and os.path.exists(uploaded_file):
-            try:
-                os.remove(uploaded_file)
-                current_app.logger.info(f"一時ファイルを削除: {uploaded_file}")
-            except Exception as del_e:
-                current_app.logger.warning(f"一時ファイルの削除に失敗: {uploaded_file}, {str(del_e)}")
+        # アップロードされた一時ファイルを削除（バックグラウンドで実行）
+        if "uploaded_file" in locals():
+            schedule_removal(uploaded_file)
         return redirect(url_for("bank_format.index"))
@@ -5,18 +5,33 @@ PDFファイルのアップロードとデータベースへの保存を処理
 """
 
 import os
-import sys
+import shutil
+import tempfile
+import threading
+import hashlib
 import logging
+import multiprocessing
+import time
+import uuid
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from datetime import datetime, timedelta
+from functools import lru_cache
 from io import BytesIO
-from typing import Dict, List
-from flask import Blueprint, flash, redirect, render_template, request, url_for, send_file
+from typing import BinaryIO, Dict, Iterable, List, NamedTuple, Optional, Tuple, Union
+from flask import Blueprint, current_app, flash, jsonify, redirect, render_template, request, url_for, send_file
 from flask_login import login_required
+from flask_wtf.csrf import generate_csrf
 from werkzeug.utils import secure_filename
 import pandas as pd
+from sqlalchemy.dialects.sqlite import insert as sqlite_insert
 from openpyxl.styles import Font, PatternFill, Alignment, Border, Side
 from app import db
 from app.models.pos_sales import PosSales
 from app.models.daily_sales import DailySales
+from app.models.daily_product_sales import DailyProductSales
+from app.models.pdf_upload import PdfUpload
+from app.models.pos_upload_job import PosUploadJob
 from app.utils.decorators import shinko_center_required
 from app.utils.pdf_processor import (
     extract_metadata_from_pdf,
@@ -26,6 +41,41 @@ from app.utils.pdf_processor import (
 
 pos_bp = Blueprint("pos", __name__, url_prefix="/pos")
 
+logger = logging.getLogger(__name__)
+
+# 非同期取込ジョブ（POS_ASYNC_UPLOADが有効な場合に使用）
+# ジョブの状態と結果はpos_upload_jobsテーブルに保存し、実行のみをこのプロセスのスレッドで行う
+_upload_executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="pos-upload")
+
+# 状態が更新されないまま経過した場合に、ジョブを失効したとみなす秒数
+# （実行中にプロセスが終了したジョブは完了しないため）
+UPLOAD_JOB_TIMEOUT = 30 * 60
+
+# 結果が確認されなかったジョブを削除するまでの秒数
+UPLOAD_JOB_RETENTION = 24 * 60 * 60
+
+# アップロードを許可するファイルの拡張子
+ALLOWED_EXTENSIONS = (".pdf",)
+
+# PDFファイルの先頭に含まれるヘッダー
+PDF_HEADER = b"%PDF-"
+
+# PDF解析を並列に実行するワーカープロセス数の上限
+MAX_PARSE_WORKERS = os.cpu_count() or 1
+
+# PDF解析用のプロセスプール（初回の複数ファイル取込時に作成し、以降のリクエストで使い回す）
+_parse_executor: Optional[ProcessPoolExecutor] = None
+_parse_executor_lock = threading.Lock()
+
+# アップロードファイルをディスクに書き出す際のチャンクサイズ（バイト）
+UPLOAD_CHUNK_SIZE = 64 * 1024
+
+# ダッシュボードの集計結果をキャッシュする秒数
+# キャッシュはプロセスごとに保持し、invalidate_dashboard_cache()も呼び出したプロセスのキャッシュしか破棄しない。
+# 複数ワーカーで動かす場合、他のワーカーではアップロードや削除の結果がこの秒数だけ遅れて表示される
+DASHBOARD_CACHE_TIMEOUT = 120
+_dashboard_cache: Dict[str, tuple] = {}
+
 
 @pos_bp.before_request
 @login_required
@@ -35,6 +85,33 @@ def require_shinko_center():
     pass
 
 
+class DatePos(NamedTuple):
+    """ダッシュボードに表示する「営業日 POSレジ番号」の1件分"""
+
+    formatted: str
+    sale_date: str
+    pos_number: str
+
+
+@lru_cache(maxsize=4096)
+def format_jp_date(sale_date: str) -> str:
+    """
+    YYYY-MM-DD形式の日付を「YYYY年MM月DD日」形式に変換する
+
+    同じ日付を何度も変換するため、結果をキャッシュする。
+
+    Args:
+        sale_date: 日付文字列（YYYY-MM-DD形式）
+
+    Returns:
+        変換後の日付文字列、変換できない場合は元の文字列
+    """
+    try:
+        return datetime.strptime(sale_date, "%Y-%m-%d").strftime("%Y年%m月%d日")
+    except (ValueError, TypeError):
+        return sale_date
+
+
 def allowed_file(filename: str) -> bool:
     """
     アップロードされたファイルがPDFかどうかをチェックする
@@ -45,13 +122,42 @@ def allowed_file(filename: str) -> bool:
     Returns:
         PDFファイルの場合はTrue、それ以外はFalse
     """
-    return "." in filename and filename.rsplit(".", 1)[1].lower() == "pdf"
+    return filename.lower().endswith(ALLOWED_EXTENSIONS)
+
+
+def _build_pos_sales_mappings(sales_records: List[Dict[str, any]], pdf_filename: str) -> List[Dict[str, any]]:
+    """
+    売上データを一括INSERT（executemany）用の辞書リストに変換する
+
+    Args:
+        sales_records: 売上データのリスト
+        pdf_filename: PDFファイル名
+
+    Returns:
+        pos_salesテーブルのカラム名をキーとする辞書のリスト
+    """
+    return [
+        {
+            "pos_number": record_data["pos_number"],
+            "sale_date": record_data["sale_date"],
+            "reported_at": record_data["reported_at"],
+            "product_code": record_data["product_code"],
+            "product_name": record_data["product_name"],
+            "quantity": record_data["quantity"],
+            "unit_price": record_data["unit_price"],
+            "subtotal": record_data["subtotal"],
+            "total_amount": record_data["total_amount"],
+            "pdf_source_file": pdf_filename,
+        }
+        for record_data in sales_records
+    ]
 
 
 def save_pdf_data_to_db(
     sales_records: List[Dict[str, any]],
     pdf_filename: str,
     overwrite: bool = False,
+    commit: bool = True,
 ) -> Dict[str, int]:
     """
     PDFから抽出したデータをpos_salesテーブルに保存する
@@ -60,6 +166,7 @@ def save_pdf_data_to_db(
         sales_records: 売上データのリスト
         pdf_filename: PDFファイル名
         overwrite: 上書きオプションが有効かどうか
+        commit: Trueの場合はコミットする。Falseの場合はコミットせず、エラー時は例外を送出する
 
     Returns:
         処理結果の統計情報（inserted, skipped, overwritten）
@@ -79,163 +186,280 @@ def save_pdf_data_to_db(
         return stats
 
     try:
-        # 既存データをチェック
-        existing_records = PosSales.query.filter_by(pos_number=pos_number, sale_date=sale_date).all()
-
-        if existing_records:
-            # 既存データが存在する場合
-            if overwrite:
-                # 上書きオプションが有効な場合
-                existing_reported_at = existing_records[0].reported_at
-
-                # reported_atを比較（文字列として比較）
-                if reported_at and reported_at > existing_reported_at:
-                    # 新しいデータの方が新しい場合、古いデータを削除
-                    for record in existing_records:
-                        db.session.delete(record)
+        if overwrite and reported_at:
+            # reported_atの比較をDELETEのWHERE句に含め、古いデータのみを1文で削除する
+            # （SELECTしてからDELETEするまでの間に他のアップロードが割り込む余地をなくす）
+            deleted = PosSales.query.filter(
+                PosSales.pos_number == pos_number,
+                PosSales.sale_date == sale_date,
+                PosSales.reported_at < reported_at,
+            ).delete(synchronize_session=False)
+
+            if deleted:
+                # 新しいデータを一括挿入（削除と同一トランザクション）
+                db.session.execute(db.insert(PosSales), _build_pos_sales_mappings(sales_records, pdf_filename))
+                if commit:
                     db.session.commit()
+                    invalidate_dashboard_cache()
+                stats["overwritten"] = len(sales_records)
+                return stats
 
-                    # 新しいデータを挿入
-                    for record_data in sales_records:
-                        pos_sale = PosSales(
-                            pos_number=record_data["pos_number"],
-                            sale_date=record_data["sale_date"],
-                            reported_at=record_data["reported_at"],
-                            product_code=record_data["product_code"],
-                            product_name=record_data["product_name"],
-                            quantity=record_data["quantity"],
-                            unit_price=record_data["unit_price"],
-                            subtotal=record_data["subtotal"],
-                            total_amount=record_data["total_amount"],
-                            pdf_source_file=pdf_filename,
-                        )
-                        db.session.add(pos_sale)
-                        stats["overwritten"] += 1
+        # 既存データをチェック
+        exists = db.session.query(PosSales.id).filter_by(pos_number=pos_number, sale_date=sale_date).first()
 
-                    db.session.commit()
-                else:
-                    # 新しいデータの方が古い場合はスキップ
-                    stats["skipped"] = len(sales_records)
-            else:
-                # 上書きオプションが無効な場合はスキップ
-                stats["skipped"] = len(sales_records)
+        if exists:
+            # 上書きオプションが無効、または既存データの方が新しい場合はスキップ
+            stats["skipped"] = len(sales_records)
         else:
-            # 既存データが存在しない場合、新規挿入
-            for record_data in sales_records:
-                try:
-                    pos_sale = PosSales(
-                        pos_number=record_data["pos_number"],
-                        sale_date=record_data["sale_date"],
-                        reported_at=record_data["reported_at"],
-                        product_code=record_data["product_code"],
-                        product_name=record_data["product_name"],
-                        quantity=record_data["quantity"],
-                        unit_price=record_data["unit_price"],
-                        subtotal=record_data["subtotal"],
-                        total_amount=record_data["total_amount"],
-                        pdf_source_file=pdf_filename,
-                    )
-                    db.session.add(pos_sale)
-                    stats["inserted"] += 1
-                except Exception as e:
-                    # UNIQUE制約違反などのエラーを捕捉
-                    db.session.rollback()
-                    stats["skipped"] += 1
-                    print(f"データ挿入エラー: {e}")
-
-            db.session.commit()
+            # 既存データが存在しない場合、新規一括挿入
+            db.session.execute(db.insert(PosSales), _build_pos_sales_mappings(sales_records, pdf_filename))
+            if commit:
+                db.session.commit()
+                invalidate_dashboard_cache()
+            stats["inserted"] = len(sales_records)
 
     except Exception as e:
+        if not commit:
+            raise
         db.session.rollback()
-        print(f"DB保存エラー: {e}")
+        logger.error("DB保存エラー: %s", e)
         stats["skipped"] = len(sales_records)
 
     return stats
 
 
-def aggregate_daily_sales(sale_date: str = None) -> Dict[str, any]:
+def is_pdf_stream(stream: BinaryIO) -> bool:
     """
-    pos_salesテーブルから日次売上を集計し、daily_salesテーブルに保存する
+    ファイルの先頭がPDFのヘッダーかどうかを確認する
+
+    確認後、読み取り位置は先頭に戻す。
 
     Args:
-        sale_date: 集計対象の営業日（YYYY-MM-DD形式）。Noneの場合は全営業日を集計
+        stream: アップロードされたファイルのストリーム
 
     Returns:
-        集計結果の統計情報（aggregated_dates: 集計した日付のリスト）
+        PDFのヘッダーで始まる場合はTrue、それ以外はFalse
+    """
+    header = stream.read(len(PDF_HEADER))
+    stream.seek(0)
+    return header == PDF_HEADER
+
+
+def compute_pdf_hash(pdf_data: Union[bytes, str, BinaryIO]) -> str:
+    """
+    PDFファイル内容のSHA-256ハッシュ値を計算する
+
+    ストリームを渡した場合は、計算後に読み取り位置を先頭に戻す。
+
+    Args:
+        pdf_data: PDFファイルの内容、ディスクに保存したPDFファイルのパス、またはアップロードされたファイルのストリーム
+
+    Returns:
+        16進数表記のハッシュ値
+    """
+    if isinstance(pdf_data, bytes):
+        return hashlib.sha256(pdf_data).hexdigest()
+
+    h = hashlib.sha256()
+    if isinstance(pdf_data, str):
+        with open(pdf_data, "rb") as f:
+            for chunk in iter(lambda: f.read(1 << 20), b""):
+                h.update(chunk)
+    else:
+        for chunk in iter(lambda: pdf_data.read(1 << 20), b""):
+            h.update(chunk)
+        pdf_data.seek(0)
+    return h.hexdigest()
+
+
+def parse_pdf_upload(filename: str, pdf_data: Union[bytes, str]) -> Dict[str, any]:
+    """
+    アップロードされたPDF1件を解析し、pos_salesテーブル用のレコードを生成する
+
+    DBにはアクセスしないため、ワーカープロセスから呼び出せる。
+
+    Args:
+        filename: PDFファイル名
+        pdf_data: PDFファイルの内容、またはディスクに保存したPDFファイルのパス
+
+    Returns:
+        解析結果の辞書（filename, sales_records, error）。
+        解析に失敗した場合はerrorにエラー内容が設定される
     """
+    result = {"filename": filename, "sales_records": [], "error": None}
+
     try:
-        # 集計対象の日付を取得
-        if sale_date:
-            # 特定の日付のみ集計
-            dates_to_aggregate = [sale_date]
-        else:
-            # 全営業日を集計
-            dates_to_aggregate = (
-                db.session.query(PosSales.sale_date).distinct().order_by(PosSales.sale_date.desc()).all()
+        pdf_buffer = pdf_data if isinstance(pdf_data, str) else BytesIO(pdf_data)
+        logger.debug("ファイルを読み込みました: %s", filename)
+
+        # PDFからメタデータを抽出
+        metadata = extract_metadata_from_pdf(pdf_buffer)
+        logger.debug("メタデータ抽出結果: %s", metadata)
+
+        # メタデータの検証
+        if not metadata.get("pos_number") or not metadata.get("sale_date"):
+            logger.error(
+                "メタデータが不足しています: pos_number=%s, sale_date=%s",
+                metadata.get("pos_number"),
+                metadata.get("sale_date"),
             )
-            dates_to_aggregate = [date[0] for date in dates_to_aggregate]
+            result["error"] = "メタデータ不足"
+            return result
 
-        aggregated_dates = []
+        # PDFからテーブルデータを抽出
+        table_data = extract_table_data_from_pdf(pdf_buffer)
+        logger.debug("テーブルデータ抽出結果: %s行", len(table_data))
 
-        for target_date in dates_to_aggregate:
-            # 該当日の合計売上を集計
-            # Issue #15の要件: SUM(total_amount) AS subtotal FROM pos_sales GROUP BY sale_date
-            # ただし、total_amountはPOSレジごとの総合計なので、重複を避けるため
-            # 各POSレジのtotal_amountを1回だけカウントする必要がある
-            # 実際には、各商品のsubtotalの合計を計算する方が正確
-            result = (
-                db.session.query(db.func.sum(PosSales.subtotal).label("total_sales"))
-                .filter(PosSales.sale_date == target_date)
-                .first()
-            )
+        if not table_data:
+            logger.error("テーブルデータが抽出できませんでした")
+            result["error"] = "テーブルデータなし"
+            return result
 
-            if result and result.total_sales:
-                total_sales_amount = int(result.total_sales)
+        # データを整形
+        sales_records = parse_sales_data(table_data, metadata)
+        logger.debug("整形後のレコード数: %s", len(sales_records))
 
-                # daily_salesテーブルに保存または更新
-                existing_daily_sale = DailySales.query.filter_by(sale_date=target_date).first()
+        if not sales_records:
+            logger.error("有効なレコードが生成されませんでした。テーブルデータ: %s行", len(table_data))
+            result["error"] = "有効なレコードなし"
+            return result
 
-                if existing_daily_sale:
-                    # 既存データを更新
-                    existing_daily_sale.total_sales_amount = total_sales_amount
-                    from datetime import datetime
+        result["sales_records"] = sales_records
 
-                    existing_daily_sale.created_at = datetime.utcnow()
-                else:
-                    # 新規データを挿入
-                    daily_sale = DailySales(
-                        sale_date=target_date,
-                        total_sales_amount=total_sales_amount,
-                    )
-                    db.session.add(daily_sale)
+    except Exception as e:
+        logger.exception("ファイル処理エラー (%s): %s", filename, e)
+        result["error"] = str(e)
 
-                aggregated_dates.append(target_date)
+    return result
 
-        db.session.commit()
-        print(f"[DEBUG] 日次売上集計完了: {len(aggregated_dates)}件の日付を集計しました")
-        sys.stdout.flush()
+
+def aggregate_daily_sales(
+    sale_dates: Optional[Union[str, Iterable[str]]] = None,
+    commit: bool = True,
+) -> Dict[str, any]:
+    """
+    pos_salesテーブルから日次売上を集計し、daily_salesテーブルに保存する
+
+    商品別の集計結果もdaily_product_salesテーブルに保存し直す。
+
+    Args:
+        sale_dates: 集計対象の営業日（YYYY-MM-DD形式）、またはそのリスト。Noneの場合は全営業日を集計
+        commit: Trueの場合はコミットする。Falseの場合はフラッシュのみ行い、エラー時は例外を送出する
+
+    Returns:
+        集計結果の統計情報（aggregated_dates: 集計した日付のリスト）
+    """
+    try:
+        # 営業日ごとの合計売上を1回のGROUP BYで集計
+        # Issue #15の要件: SUM(total_amount) AS subtotal FROM pos_sales GROUP BY sale_date
+        # ただし、total_amountはPOSレジごとの総合計なので、重複を避けるため
+        # 各POSレジのtotal_amountを1回だけカウントする必要がある
+        # 実際には、各商品のsubtotalの合計を計算する方が正確
+        query = db.session.query(
+            PosSales.sale_date,
+            db.func.sum(PosSales.subtotal).label("total_sales"),
+        )
+        if sale_dates is not None:
+            # 特定の日付のみ集計
+            sale_dates = [sale_dates] if isinstance(sale_dates, str) else list(sale_dates)
+            query = query.filter(PosSales.sale_date.in_(sale_dates))
+        totals = query.group_by(PosSales.sale_date).order_by(PosSales.sale_date.desc()).all()
+        totals = [(target_date, int(total_sales)) for target_date, total_sales in totals if total_sales]
+
+        # 既存の集計データを1回のクエリで取得（同営業日に複数ある場合は最初の1件を更新対象とする）
+        existing_daily_sales = {}
+        if totals:
+            for daily_sale in (
+                DailySales.query.filter(DailySales.sale_date.in_([target_date for target_date, _ in totals]))
+                .order_by(DailySales.id)
+                .all()
+            ):
+                existing_daily_sales.setdefault(daily_sale.sale_date, daily_sale)
+
+        aggregated_dates = []
+
+        for target_date, total_sales_amount in totals:
+            # daily_salesテーブルに保存または更新
+            existing_daily_sale = existing_daily_sales.get(target_date)
+
+            if existing_daily_sale:
+                # 既存データを更新
+                existing_daily_sale.total_sales_amount = total_sales_amount
+                existing_daily_sale.created_at = datetime.utcnow()
+            else:
+                # 新規データを挿入
+                daily_sale = DailySales(
+                    sale_date=target_date,
+                    total_sales_amount=total_sales_amount,
+                )
+                db.session.add(daily_sale)
+
+            aggregated_dates.append(target_date)
+
+        # 対象日のうちpos_salesのデータがなくなった日（最後のPOSレジを削除した場合など）は、
+        # 古い合計が残らないよう集計データを削除する
+        if sale_dates is not None:
+            emptied_dates = set(sale_dates) - set(aggregated_dates)
+            if emptied_dates:
+                DailySales.query.filter(DailySales.sale_date.in_(emptied_dates)).delete(synchronize_session=False)
+
+        # 商品別集計を作り直す（対象日の既存データを削除し、pos_salesから一括で再集計）
+        delete_query = DailyProductSales.query
+        product_query = db.select(
+            PosSales.sale_date,
+            PosSales.product_code,
+            PosSales.product_name,
+            db.func.sum(PosSales.quantity),
+            db.func.sum(PosSales.subtotal),
+        )
+        if sale_dates is not None:
+            delete_query = delete_query.filter(DailyProductSales.sale_date.in_(sale_dates))
+            product_query = product_query.where(PosSales.sale_date.in_(sale_dates))
+        delete_query.delete(synchronize_session=False)
+        db.session.execute(
+            db.insert(DailyProductSales).from_select(
+                ["sale_date", "product_code", "product_name", "total_quantity", "total_subtotal"],
+                product_query.group_by(PosSales.sale_date, PosSales.product_code, PosSales.product_name),
+            )
+        )
+
+        if commit:
+            db.session.commit()
+        else:
+            db.session.flush()
+        logger.debug("日次売上集計完了: %s件の日付を集計しました", len(aggregated_dates))
 
         return {"aggregated_dates": aggregated_dates, "count": len(aggregated_dates)}
 
     except Exception as e:
+        if not commit:
+            raise
         db.session.rollback()
-        import traceback
-
-        print(f"[ERROR] 日次売上集計エラー: {e}")
-        print(f"[ERROR] トレースバック:\n{traceback.format_exc()}")
-        sys.stdout.flush()
+        logger.exception("日次売上集計エラー: %s", e)
         return {"aggregated_dates": [], "count": 0, "error": str(e)}
 
 
-@pos_bp.route("/")
-def dashboard():
+def invalidate_dashboard_cache() -> None:
     """
-    POSデータ管理ダッシュボード
+    ダッシュボードの集計結果キャッシュを破棄する
+
+    pos_salesテーブルを更新した後に呼び出す。
+    """
+    _dashboard_cache.clear()
+
+
+def get_dashboard_summary() -> Tuple[int, List[DatePos]]:
+    """
+    ダッシュボードに表示する総レコード数と「営業日 POSレジ番号」の一覧を取得する
+
+    pos_salesテーブル全体を走査するため、結果をDASHBOARD_CACHE_TIMEOUT秒間キャッシュする。
 
     Returns:
-        ダッシュボードページのHTML
+        総レコード数と、営業日・POSレジ番号のリストのタプル
     """
-    from flask_wtf.csrf import generate_csrf
+    cached = _dashboard_cache.get("summary")
+    if cached and time.monotonic() - cached[0] < DASHBOARD_CACHE_TIMEOUT:
+        return cached[1]
 
     # 統計情報を取得
     total_records = PosSales.query.count()
@@ -250,24 +474,30 @@ def dashboard():
     )
 
     # 「営業日 POSレジ番号」形式のリストを作成
-    date_pos_list = []
-    from datetime import datetime
-
-    for sale_date, pos_number in date_pos_combinations:
-        # 日付を読みやすい形式に変換（例: 2025-11-05 → 2025年11月5日）
-        try:
-            date_obj = datetime.strptime(str(sale_date), "%Y-%m-%d")
-            formatted_date = date_obj.strftime("%Y年%m月%d日")
-        except (ValueError, TypeError):
-            formatted_date = str(sale_date)
-
-        date_pos_list.append(
-            {
-                "formatted": f"{formatted_date} {pos_number}",
-                "sale_date": str(sale_date),
-                "pos_number": str(pos_number),
-            }
+    # 日付は読みやすい形式に変換（例: 2025-11-05 → 2025年11月05日）
+    date_pos_list = [
+        DatePos(
+            formatted=f"{format_jp_date(str(sale_date))} {pos_number}",
+            sale_date=str(sale_date),
+            pos_number=str(pos_number),
         )
+        for sale_date, pos_number in date_pos_combinations
+    ]
+
+    summary = (total_records, date_pos_list)
+    _dashboard_cache["summary"] = (time.monotonic(), summary)
+    return summary
+
+
+@pos_bp.route("/")
+def dashboard():
+    """
+    POSデータ管理ダッシュボード
+
+    Returns:
+        ダッシュボードページのHTML
+    """
+    total_records, date_pos_list = get_dashboard_summary()
 
     return render_template(
         "pos/dashboard.html",
@@ -277,6 +507,266 @@ def dashboard():
     )
 
 
+def get_parse_executor() -> ProcessPoolExecutor:
+    """
+    PDF解析用のプロセスプールを取得する
+
+    プールはプロセス内で1つだけ作成して使い回す。
+    スレッドが保持しているロック（ログ、DB接続プールなど）を子プロセスに引き継がないよう、
+    forkではなくspawnでワーカープロセスを起動する。
+
+    Returns:
+        PDF解析用のプロセスプール
+    """
+    global _parse_executor
+
+    with _parse_executor_lock:
+        if _parse_executor is None:
+            _parse_executor = ProcessPoolExecutor(
+                max_workers=MAX_PARSE_WORKERS,
+                mp_context=multiprocessing.get_context("spawn"),
+            )
+        return _parse_executor
+
+
+def parse_pdf_uploads_in_pool(uploads: List[Tuple[str, str, Union[bytes, str]]]) -> List[Dict[str, any]]:
+    """
+    複数のPDFをプロセスプールで並列に解析する
+
+    ワーカープロセスにはファイルの内容ではなくパスのみを渡す。
+    メモリ上のPDFは一時ディレクトリに書き出してから解析し、解析後に削除する。
+    プールが使用できなくなった場合は、このプロセス内で解析する。
+
+    Args:
+        uploads: (ハッシュ値, ファイル名, PDFファイルの内容またはパス) のリスト
+
+    Returns:
+        parse_pdf_uploadの結果のリスト（アップロード順）
+    """
+    global _parse_executor
+
+    with tempfile.TemporaryDirectory(prefix="pos-parse-") as tmp_dir:
+        filenames = []
+        pdf_paths = []
+        for pdf_hash, filename, pdf_source in uploads:
+            if isinstance(pdf_source, bytes):
+                pdf_path = os.path.join(tmp_dir, f"{pdf_hash}.pdf")
+                with open(pdf_path, "wb") as f:
+                    f.write(pdf_source)
+                pdf_source = pdf_path
+            filenames.append(filename)
+            pdf_paths.append(pdf_source)
+
+        try:
+            return list(get_parse_executor().map(parse_pdf_upload, filenames, pdf_paths))
+        except BrokenProcessPool:
+            logger.exception("PDF解析用のプロセスプールが使用できないため、プロセス内で解析します")
+            with _parse_executor_lock:
+                _parse_executor = None
+            return [parse_pdf_upload(filename, pdf_path) for filename, pdf_path in zip(filenames, pdf_paths)]
+
+
+def record_pdf_upload(pdf_hash: str, filename: str, pos_number: str, sale_date: str) -> None:
+    """
+    PDFの取込履歴を記録する
+
+    同じPDFが同時にアップロードされた場合や、上書き取込で再度記録する場合に
+    主キーの重複で他のファイルの取込までロールバックされないよう、既存の履歴があれば何もしない。
+
+    Args:
+        pdf_hash: PDFファイル内容のSHA-256ハッシュ値
+        filename: アップロード時のファイル名
+        pos_number: POSレジ番号
+        sale_date: 売上日 (YYYY-MM-DD)
+    """
+    db.session.execute(
+        sqlite_insert(PdfUpload)
+        .values(sha256=pdf_hash, filename=filename, pos_number=pos_number, sale_date=sale_date)
+        .on_conflict_do_nothing(index_elements=[PdfUpload.sha256])
+    )
+
+
+def ingest_pdf_uploads(
+    uploads: List[Tuple[str, str, Union[bytes, str]]],
+    overwrite: bool = False,
+) -> Dict[str, any]:
+    """
+    アップロードされたPDFを解析し、pos_salesテーブルへの保存と日次集計を行う
+
+    DBへの保存と日次集計は1つのトランザクションで行い、エラー時はすべてロールバックする。
+    アプリケーションコンテキスト内で呼び出す必要がある。
+
+    Args:
+        uploads: (ハッシュ値, ファイル名, PDFファイルの内容またはパス) のリスト
+        overwrite: 上書きオプションが有効かどうか
+
+    Returns:
+        取込結果（stats, processed_files, error_files, uploaded_dates, error）
+    """
+    summary = {
+        "stats": {"inserted": 0, "skipped": 0, "overwritten": 0},
+        "processed_files": 0,
+        "error_files": [],
+        "uploaded_dates": set(),
+        "error": None,
+    }
+
+    # PDFの解析はCPU負荷が高いため、複数ファイルの場合はプロセスを分けて並列に実行する
+    # （結果はアップロード順に返る）
+    if len(uploads) > 1 and MAX_PARSE_WORKERS > 1:
+        parse_results = parse_pdf_uploads_in_pool(uploads)
+    else:
+        parse_results = [parse_pdf_upload(filename, pdf_source) for _, filename, pdf_source in uploads]
+
+    # DBへの保存と日次集計は順番に行い、最後に1回だけコミットする
+    try:
+        for (pdf_hash, _, _), result in zip(uploads, parse_results):
+            filename = result["filename"]
+            if result["error"]:
+                summary["error_files"].append(f"{filename} ({result['error']})")
+                continue
+
+            stats = save_pdf_data_to_db(result["sales_records"], filename, overwrite, commit=False)
+
+            # 取込履歴を記録し、同じPDFが再度アップロードされた場合は解析をスキップできるようにする
+            # （すべて重複としてスキップされた場合は、取り込んでいないため記録しない）
+            first_record = result["sales_records"][0]
+            if stats["inserted"] or stats["overwritten"]:
+                record_pdf_upload(pdf_hash, filename, first_record["pos_number"], first_record["sale_date"])
+            logger.debug("DB保存結果: %s", stats)
+            for key in summary["stats"]:
+                summary["stats"][key] += stats[key]
+            summary["processed_files"] += 1
+            summary["uploaded_dates"].add(first_record["sale_date"])
+
+        # アップロードされたファイルの営業日をまとめて集計
+        if summary["uploaded_dates"]:
+            aggregate_daily_sales(summary["uploaded_dates"], commit=False)
+
+        db.session.commit()
+        invalidate_dashboard_cache()
+    except Exception as e:
+        db.session.rollback()
+        logger.exception("DB保存エラー: %s", e)
+        summary.update(processed_files=0, uploaded_dates=set(), error=str(e))
+
+    return summary
+
+
+def build_upload_messages(summary: Dict[str, any]) -> List[Tuple[str, str]]:
+    """
+    取込結果から画面に表示するメッセージを生成する
+
+    Args:
+        summary: ingest_pdf_uploadsの戻り値（duplicate_filesを追加したもの）
+
+    Returns:
+        (カテゴリ, メッセージ) のリスト
+    """
+    if summary["error"]:
+        return [("error", f"データの保存中にエラーが発生しました。取り込みを中止しました: {summary['error']}")]
+
+    messages = []
+    total_stats = summary["stats"]
+    duplicate_files = summary.get("duplicate_files", [])
+
+    if summary["processed_files"] > 0:
+        message = f"{summary['processed_files']}件のファイルを取り込みました。"
+        if total_stats["inserted"] > 0:
+            message += f" {total_stats['inserted']}件を新規登録しました。"
+        if total_stats["skipped"] > 0:
+            message += f" {total_stats['skipped']}件は重複のためスキップしました。"
+        if total_stats["overwritten"] > 0:
+            message += f" {total_stats['overwritten']}件を上書きしました。"
+        messages.append(("success", message))
+    elif not duplicate_files:
+        messages.append(("error", "処理できたファイルがありませんでした。"))
+
+    if duplicate_files:
+        messages.append(("info", f"取込済みのためスキップしたファイル: {', '.join(duplicate_files)}"))
+
+    if summary["error_files"]:
+        messages.append(("warning", f"エラーが発生したファイル: {', '.join(summary['error_files'])}"))
+
+    return messages
+
+
+def _run_upload_job(
+    app,
+    job_id: str,
+    uploads: List[Tuple[str, str, Union[bytes, str]]],
+    overwrite: bool,
+    duplicate_files: List[str],
+    error_files: List[str],
+) -> None:
+    """バックグラウンドで取込処理を実行し、結果をジョブに記録する"""
+    with app.app_context():
+        try:
+            PosUploadJob.query.filter_by(id=job_id).update({"status": "running"}, synchronize_session=False)
+            db.session.commit()
+
+            try:
+                summary = ingest_pdf_uploads(uploads, overwrite)
+            except Exception as e:
+                db.session.rollback()
+                logger.exception("取込ジョブエラー (%s): %s", job_id, e)
+                summary = {"error": str(e), "uploaded_dates": set()}
+            summary["duplicate_files"] = duplicate_files
+            summary["error_files"] = error_files + summary.get("error_files", [])
+            # JSONとして保存するため、営業日の集合はリストに変換する
+            summary["uploaded_dates"] = sorted(summary["uploaded_dates"])
+
+            updated = PosUploadJob.query.filter_by(id=job_id).update(
+                {"status": "finished", "summary": summary}, synchronize_session=False
+            )
+            db.session.commit()
+            if not updated:
+                logger.warning("取込ジョブが削除されていたため、結果を記録できませんでした: %s", job_id)
+        finally:
+            db.session.remove()
+
+
+def start_upload_job(
+    uploads: List[Tuple[str, str, Union[bytes, str]]],
+    overwrite: bool,
+    duplicate_files: List[str],
+    error_files: List[str],
+) -> str:
+    """
+    取込処理をバックグラウンドジョブとして登録する
+
+    SQLiteへの書き込みが競合しないよう、ジョブは1件ずつ順番に実行する。
+
+    Args:
+        uploads: (ハッシュ値, ファイル名, PDFファイルの内容またはパス) のリスト
+        overwrite: 上書きオプションが有効かどうか
+        duplicate_files: 取込済みのためスキップしたファイル名のリスト
+        error_files: 解析前にエラーとなったファイルのリスト
+
+    Returns:
+        ジョブID
+    """
+    job_id = uuid.uuid4().hex
+
+    # 結果が確認されなかった古いジョブを削除する
+    expired_before = datetime.utcnow() - timedelta(seconds=UPLOAD_JOB_RETENTION)
+    PosUploadJob.query.filter(PosUploadJob.created_at < expired_before).delete(synchronize_session=False)
+
+    db.session.add(PosUploadJob(id=job_id, status="queued"))
+    db.session.commit()
+
+    _upload_executor.submit(
+        _run_upload_job,
+        current_app._get_current_object(),
+        job_id,
+        uploads,
+        overwrite,
+        duplicate_files,
+        error_files,
+    )
+    return job_id
+
+
 @pos_bp.route("/upload", methods=["GET", "POST"])
 def upload():
     """
@@ -285,8 +775,6 @@ def upload():
     GET: アップロードフォームを表示
     POST: アップロードされたPDFファイルを処理してDBに保存
     """
-    from flask_wtf.csrf import generate_csrf
-
     if request.method == "GET":
         return render_template("pos/upload.html", csrf_token=generate_csrf())
 
@@ -302,126 +790,117 @@ def upload():
         flash("ファイルが選択されていません。", "error")
         return redirect(url_for("pos.upload"))
 
-    # アップロードディレクトリの作成
+    # デバッグ用にアップロードファイルを残す設定の場合のみ、保存先ディレクトリを用意する
+    keep_uploads = current_app.config.get("POS_KEEP_UPLOADS", False)
     upload_dir = os.path.join(os.path.dirname(os.path.dirname(os.path.dirname(__file__))), "uploads")
-    os.makedirs(upload_dir, exist_ok=True)
+    if keep_uploads:
+        os.makedirs(upload_dir, exist_ok=True)
 
-    total_stats = {"inserted": 0, "skipped": 0, "overwritten": 0}
-    processed_files = 0
     error_files = []
 
+    # ファイルの読み込みはリクエスト内で行い、解析のみをワーカープロセスに渡す
+    uploads = []
+    upload_hashes = set()
+    duplicate_files = []
     for file in files:
         if file and allowed_file(file.filename):
             filename = secure_filename(file.filename)
-            filepath = os.path.join(upload_dir, filename)
 
-            try:
-                # ファイルを保存
-                file.save(filepath)
-                # ログを確実に出力
-                logger = logging.getLogger(__name__)
-                logger.info(f"[DEBUG] ファイルを保存しました: {filename}")
-                print(f"[DEBUG] ファイルを保存しました: {filename}", flush=True)
-                sys.stdout.flush()
-
-                # PDFからメタデータを抽出
-                metadata = extract_metadata_from_pdf(filepath)
-                logger.info(f"[DEBUG] メタデータ抽出結果: {metadata}")
-                print(f"[DEBUG] メタデータ抽出結果: {metadata}", flush=True)
-                sys.stdout.flush()
-
-                # メタデータの検証
-                if not metadata.get("pos_number") or not metadata.get("sale_date"):
-                    error_files.append(f"{filename} (メタデータ不足)")
-                    pos_num = metadata.get("pos_number")
-                    sale_dt = metadata.get("sale_date")
-                    print(
-                        f"[ERROR] メタデータが不足しています: " f"pos_number={pos_num}, sale_date={sale_dt}"
-                    )
-                    if os.path.exists(filepath):
-                        os.remove(filepath)
-                    continue
-
-                # PDFからテーブルデータを抽出
-                table_data = extract_table_data_from_pdf(filepath)
-                print(f"[DEBUG] テーブルデータ抽出結果: {len(table_data)}行")
-
-                if not table_data:
-                    error_files.append(f"{filename} (テーブルデータなし)")
-                    print("[ERROR] テーブルデータが抽出できませんでした")
-                    if os.path.exists(filepath):
-                        os.remove(filepath)
-                    continue
-
-                # データを整形
-                sales_records = parse_sales_data(table_data, metadata)
-                print(f"[DEBUG] 整形後のレコード数: {len(sales_records)}")
-
-                if sales_records:
-                    # DBに保存
-                    stats = save_pdf_data_to_db(sales_records, filename, overwrite)
-                    print(f"[DEBUG] DB保存結果: {stats}")
-                    total_stats["inserted"] += stats["inserted"]
-                    total_stats["skipped"] += stats["skipped"]
-                    total_stats["overwritten"] += stats["overwritten"]
-                    processed_files += 1
-                else:
-                    error_files.append(f"{filename} (有効なレコードなし)")
-                    print(
-                        f"[ERROR] 有効なレコードが生成されませんでした。テーブルデータ: {len(table_data)}行"
-                    )
+            # ディスクへの保存や解析の前に、PDFのヘッダーを確認する
+            if not is_pdf_stream(file.stream):
+                error_files.append(f"{filename} (PDFファイルではありません)")
+                continue
 
-                # 一時ファイルを削除
-                if os.path.exists(filepath):
-                    os.remove(filepath)
+            # ディスクに保存する場合は、保存前にストリームからハッシュ値を計算する
+            if keep_uploads:
+                pdf_source = None
+                pdf_hash = compute_pdf_hash(file.stream)
+            else:
+                pdf_source = file.read()
+                pdf_hash = compute_pdf_hash(pdf_source)
+
+            # 取込済みのPDF（同一内容）は解析せずにスキップする
+            # （上書きが指定された場合は取込履歴を確認せず、同じリクエスト内の重複のみスキップする）
+            if pdf_hash in upload_hashes or (not overwrite and db.session.get(PdfUpload, pdf_hash)):
+                duplicate_files.append(filename)
+                continue
+            upload_hashes.add(pdf_hash)
+
+            if keep_uploads:
+                # 同名のファイルや解析中のファイルを上書きしないよう、一意なファイル名でチャンク単位に書き出し、
+                # 保存したファイルを解析する
+                with tempfile.NamedTemporaryFile(
+                    dir=upload_dir, prefix=f"{pdf_hash[:16]}_", suffix=f"_{filename}", delete=False
+                ) as f:
+                    shutil.copyfileobj(file.stream, f, length=UPLOAD_CHUNK_SIZE)
+                pdf_source = f.name
+            uploads.append((pdf_hash, filename, pdf_source))
+
+    # 非同期取込が有効な場合はバックグラウンドで処理し、進捗確認ページを返す
+    if current_app.config.get("POS_ASYNC_UPLOAD", False):
+        job_id = start_upload_job(uploads, overwrite, duplicate_files, error_files)
+        return (
+            render_template(
+                "pos/upload_status.html",
+                status_url=url_for("pos.upload_status", job_id=job_id),
+            ),
+            202,
+        )
 
-            except Exception as e:
-                error_files.append(f"{filename} ({str(e)})")
-                import traceback
+    summary = ingest_pdf_uploads(uploads, overwrite)
+    summary["duplicate_files"] = duplicate_files
+    summary["error_files"] = error_files + summary["error_files"]
 
-                print(f"[ERROR] ファイル処理エラー ({filename}): {e}")
-                print(f"[ERROR] トレースバック:\n{traceback.format_exc()}")
-                if os.path.exists(filepath):
-                    os.remove(filepath)
+    for category, message in build_upload_messages(summary):
+        flash(message, category)
 
-    # 結果メッセージを生成
-    if processed_files > 0:
-        message = f"{processed_files}件のファイルを取り込みました。"
-        if total_stats["inserted"] > 0:
-            message += f" {total_stats['inserted']}件を新規登録しました。"
-        if total_stats["skipped"] > 0:
-            message += f" {total_stats['skipped']}件は重複のためスキップしました。"
-        if total_stats["overwritten"] > 0:
-            message += f" {total_stats['overwritten']}件を上書きしました。"
-        flash(message, "success")
-    else:
-        flash("処理できたファイルがありませんでした。", "error")
+    # 集計完了後、最新の日付の集計結果ページにリダイレクト
+    if summary["uploaded_dates"]:
+        latest_date = max(summary["uploaded_dates"])
+        return redirect(url_for("pos.results", sale_date=latest_date))
 
-    if error_files:
-        flash(f"エラーが発生したファイル: {', '.join(error_files)}", "warning")
+    return redirect(url_for("pos.dashboard"))
 
-    # アップロード完了後、集計を実行
-    if processed_files > 0:
-        try:
-            # アップロードされたファイルの営業日を取得して集計
-            # 最新のデータから営業日を取得
-            latest_records = PosSales.query.order_by(PosSales.registration_date.desc()).limit(100).all()
-            uploaded_dates = set()
-            for record in latest_records:
-                uploaded_dates.add(record.sale_date)
-
-            for sale_date in uploaded_dates:
-                aggregate_daily_sales(sale_date)
-
-            # 集計完了後、最新の日付の集計結果ページにリダイレクト
-            if uploaded_dates:
-                latest_date = max(uploaded_dates)
-                return redirect(url_for("pos.results", sale_date=latest_date))
-        except Exception as e:
-            print(f"[WARNING] 集計処理でエラーが発生しました: {e}")
-            sys.stdout.flush()
 
-    return redirect(url_for("pos.dashboard"))
+@pos_bp.route("/upload/status/<job_id>")
+def upload_status(job_id: str):
+    """
+    非同期取込ジョブの状態を返す
+
+    ジョブが完了している場合は結果メッセージをフラッシュし、遷移先のURLを返す。
+
+    Args:
+        job_id: ジョブID
+
+    Returns:
+        ジョブの状態（status, redirect_url）のJSON
+    """
+    job = db.session.get(PosUploadJob, job_id)
+
+    # 結果を表示済み・削除済みのジョブ、または実行中にプロセスが終了したジョブは失効とする
+    if job is None:
+        return jsonify({"status": "expired"}), 404
+    if job.status != "finished":
+        if job.updated_at < datetime.utcnow() - timedelta(seconds=UPLOAD_JOB_TIMEOUT):
+            return jsonify({"status": "expired"}), 404
+        return jsonify({"status": job.status})
+
+    # 完了したジョブの結果は一度だけ表示する（同時に確認された場合は先に削除した側のみ表示）
+    summary = job.summary
+    deleted = PosUploadJob.query.filter_by(id=job_id).delete(synchronize_session=False)
+    db.session.commit()
+    if not deleted:
+        return jsonify({"status": "expired"}), 404
+
+    for category, message in build_upload_messages(summary):
+        flash(message, category)
+
+    if summary["uploaded_dates"]:
+        redirect_url = url_for("pos.results", sale_date=max(summary["uploaded_dates"]))
+    else:
+        redirect_url = url_for("pos.dashboard")
+
+    return jsonify({"status": "finished", "redirect_url": redirect_url})
 
 
 @pos_bp.route("/aggregate", methods=["POST"])
@@ -462,32 +941,32 @@ def results(sale_date: str):
     Returns:
         集計結果ページのHTML
     """
-    from datetime import datetime
-
     # daily_salesテーブルから日次サマリを取得
     daily_sale = DailySales.query.filter_by(sale_date=sale_date).first()
 
-    # pos_salesテーブルから商品別集計を取得
-    # 商品コード、商品名ごとに数量と合計金額を集計
+    # 集計済みの商品別集計を取得
     product_summary = (
-        db.session.query(
-            PosSales.product_code,
-            PosSales.product_name,
-            db.func.sum(PosSales.quantity).label("total_quantity"),
-            db.func.sum(PosSales.subtotal).label("total_subtotal"),
-        )
-        .filter(PosSales.sale_date == sale_date)
-        .group_by(PosSales.product_code, PosSales.product_name)
-        .order_by(PosSales.product_code)  # 商品コードでソート
-        .all()
+        DailyProductSales.query.filter_by(sale_date=sale_date).order_by(DailyProductSales.product_code).all()
     )
 
+    if not product_summary:
+        # 未集計の場合はpos_salesテーブルから商品別集計を取得
+        # 商品コード、商品名ごとに数量と合計金額を集計
+        product_summary = (
+            db.session.query(
+                PosSales.product_code,
+                PosSales.product_name,
+                db.func.sum(PosSales.quantity).label("total_quantity"),
+                db.func.sum(PosSales.subtotal).label("total_subtotal"),
+            )
+            .filter(PosSales.sale_date == sale_date)
+            .group_by(PosSales.product_code, PosSales.product_name)
+            .order_by(PosSales.product_code)  # 商品コードでソート
+            .all()
+        )
+
     # 日付を読みやすい形式に変換
-    try:
-        date_obj = datetime.strptime(sale_date, "%Y-%m-%d")
-        formatted_date = date_obj.strftime("%Y年%m月%d日")
-    except (ValueError, TypeError):
-        formatted_date = sale_date
+    formatted_date = format_jp_date(sale_date)
 
     return render_template(
         "pos/results.html",
@@ -525,13 +1004,21 @@ def delete(sale_date: str, pos_number: str):
         for record in records:
             db.session.delete(record)
 
+        # 取込履歴も削除し、同じPDFを再度取り込めるようにする
+        PdfUpload.query.filter_by(sale_date=sale_date, pos_number=pos_number).delete(synchronize_session=False)
+
+        # 削除したデータを除いて、該当営業日の集計をやり直す
+        db.session.flush()
+        aggregate_daily_sales(sale_date, commit=False)
+
         # コミット
         db.session.commit()
+        invalidate_dashboard_cache()
 
         flash(f"{sale_date} {pos_number} のデータ（{record_count}件）を削除しました。", "success")
     except Exception as e:
         db.session.rollback()
-        logging.error(f"データ削除エラー: {e}")
+        logger.error("データ削除エラー: %s", e)
         flash(f"データの削除中にエラーが発生しました: {str(e)}", "error")
 
     return redirect(url_for("pos.dashboard"))
@@ -549,24 +1036,29 @@ def details(sale_date: str, pos_number: str):
     Returns:
         詳細データページのHTML
     """
-    from datetime import datetime
-
-    # pos_salesテーブルから該当するデータを取得
+    # pos_salesテーブルから該当するデータを取得（画面に表示するカラムのみ）
     sales_records = (
-        PosSales.query.filter_by(sale_date=sale_date, pos_number=pos_number)
+        PosSales.query.with_entities(
+            PosSales.product_code,
+            PosSales.product_name,
+            PosSales.quantity,
+            PosSales.unit_price,
+            PosSales.subtotal,
+        )
+        .filter_by(sale_date=sale_date, pos_number=pos_number)
         .order_by(PosSales.product_code)
         .all()
     )
 
     # 日付を読みやすい形式に変換
-    try:
-        date_obj = datetime.strptime(sale_date, "%Y-%m-%d")
-        formatted_date = date_obj.strftime("%Y年%m月%d日")
-    except (ValueError, TypeError):
-        formatted_date = sale_date
+    formatted_date = format_jp_date(sale_date)
 
     # 合計金額を計算
-    total_amount = sum(record.subtotal for record in sales_records) if sales_records else 0
+    total_amount = (
+        db.session.query(db.func.coalesce(db.func.sum(PosSales.subtotal), 0))
+        .filter_by(sale_date=sale_date, pos_number=pos_number)
+        .scalar()
+    )
 
     return render_template(
         "pos/details.html",
@@ -781,11 +1273,7 @@ def generate_sales_excel(sale_date: str) -> BytesIO:
         return output
 
     except Exception as e:
-        import traceback
-
-        print(f"[ERROR] Excel生成エラー: {e}")
-        print(f"[ERROR] トレースバック:\n{traceback.format_exc()}")
-        sys.stdout.flush()
+        logger.exception("Excel生成エラー: %s", e)
         raise
 
 
@@ -4,20 +4,101 @@
 ユーザー情報の管理処理を行う。
 """
 
-from flask import Blueprint, flash, redirect, render_template, url_for
+import time
+from datetime import datetime
+from typing import Dict, List, NamedTuple, Tuple
+from flask import Blueprint, abort, flash, redirect, render_template, url_for
 from flask_login import login_required, current_user
 from werkzeug.security import generate_password_hash
+from sqlalchemy import delete, not_, update
+from sqlalchemy.orm import raiseload
 from app import db
 from app.models import User
-from app.utils.decorators import user_management_required
+from app.utils.decorators import max_queries, user_management_required
 from app.forms.user_management import EditUserForm
 
 user_management_bp = Blueprint("user_management", __name__, url_prefix="/user-management")
 
+# 所属ごとのユーザー一覧をキャッシュする秒数
+# キャッシュはプロセスごとに保持し、invalidate_user_list_cache()も呼び出したプロセスのキャッシュしか破棄しない。
+# 複数ワーカーで動かす場合、他のワーカーでは権限の変更やユーザーの削除がこの秒数だけ遅れて表示されるため、
+# 権限情報が古いまま表示される時間を抑えるよう短くしている
+USER_LIST_CACHE_TIMEOUT = 5
+_user_list_cache: Dict[str, Tuple[float, List["UserRow"]]] = {}
+
+
+class UserRow(NamedTuple):
+    """ユーザー管理ダッシュボードに表示するユーザー1件分"""
+
+    id: int
+    username: str
+    email: str
+    department: str
+    can_manage_users: bool
+    created_at: datetime
+
+
+def get_target_user_row(user_id: int):
+    """
+    権限チェック用に対象ユーザーのID・ユーザー名・所属のみを取得する
+
+    Args:
+        user_id: 対象ユーザーのID
+
+    Returns:
+        (id, username, department) の行
+
+    Raises:
+        NotFound: ユーザーが存在しない場合（404）
+    """
+    row = User.query.with_entities(User.id, User.username, User.department).filter_by(id=user_id).first()
+    if row is None:
+        abort(404)
+    return row
+
+
+def invalidate_user_list_cache() -> None:
+    """
+    ユーザー一覧のキャッシュを破棄する
+
+    ユーザーの登録・更新・削除後に呼び出す。
+    """
+    _user_list_cache.clear()
+
+
+def get_department_users(department: str) -> List[UserRow]:
+    """
+    指定した所属のユーザー一覧をID番号の昇順で取得する
+
+    結果は所属ごとにUSER_LIST_CACHE_TIMEOUT秒間キャッシュする。
+
+    Args:
+        department: 所属
+
+    Returns:
+        ユーザーのリスト
+    """
+    cached = _user_list_cache.get(department)
+    if cached and time.monotonic() - cached[0] < USER_LIST_CACHE_TIMEOUT:
+        return cached[1]
+
+    users = [
+        UserRow(*row)
+        for row in User.query.with_entities(
+            User.id, User.username, User.email, User.department, User.can_manage_users, User.created_at
+        )
+        .filter_by(department=department)
+        .order_by(User.id.asc())
+        .all()
+    ]
+    _user_list_cache[department] = (time.monotonic(), users)
+    return users
+
 
 @user_management_bp.route("/")
 @login_required
 @user_management_required
+@max_queries(1)
 def dashboard():
     """
     ユーザー管理のダッシュボードを表示する
@@ -30,13 +111,14 @@ def dashboard():
     from flask_wtf.csrf import generate_csrf
 
     # ログインユーザーの所属と同じ所属のユーザーのみを取得（ID番号の昇順で並び替え）
-    users = User.query.filter_by(department=current_user.department).order_by(User.id.asc()).all()
+    users = get_department_users(current_user.department)
     return render_template("user_management/dashboard.html", users=users, csrf_token=generate_csrf())
 
 
 @user_management_bp.route("/edit/<int:user_id>", methods=["GET", "POST"])
 @login_required
 @user_management_required
+@max_queries(4)
 def edit_user(user_id):
     """
     ユーザー情報を編集する
@@ -48,7 +130,8 @@ def edit_user(user_id):
         編集成功時: ユーザー管理ダッシュボードへのリダイレクト
         編集失敗時: ユーザー編集画面の再表示
     """
-    user = User.query.get_or_404(user_id)
+    # リレーションの遅延読み込みが発生した場合はエラーにする（N+1クエリの混入防止）
+    user = db.get_or_404(User, user_id, options=[raiseload("*")])
 
     # 同じ所属のユーザーのみ編集可能
     if user.department != current_user.department:
@@ -56,21 +139,25 @@ def edit_user(user_id):
         return redirect(url_for("user_management.dashboard"))
 
     form = EditUserForm(obj=user)
+    form.user_id = user.id
     form.original_email = user.email
     form.original_username = user.username
 
     if form.validate_on_submit():
+        # パスワードのハッシュ化はCPU負荷が高いため、更新対象の属性を変更する前に済ませておく
+        # （入力されている場合のみ）
+        hashed_password = generate_password_hash(form.password.data) if form.password.data else None
+
         try:
             # ユーザー情報を更新
             user.username = form.username.data
             user.email = form.email.data
             user.department = form.department.data
-
-            # パスワードが入力されている場合のみ更新
-            if form.password.data:
-                user.hashed_password = generate_password_hash(form.password.data)
+            if hashed_password:
+                user.hashed_password = hashed_password
 
             db.session.commit()
+            invalidate_user_list_cache()
 
             flash(f"{user.username}さんの情報を更新しました。", "success")
             return redirect(url_for("user_management.dashboard"))
@@ -84,6 +171,7 @@ def edit_user(user_id):
 @user_management_bp.route("/delete/<int:user_id>", methods=["POST"])
 @login_required
 @user_management_required
+@max_queries(2)
 def delete_user(user_id):
     """
     ユーザーを削除する
@@ -94,22 +182,23 @@ def delete_user(user_id):
     Returns:
         ユーザー管理ダッシュボードへのリダイレクト
     """
-    user = User.query.get_or_404(user_id)
+    target = get_target_user_row(user_id)
 
     # 同じ所属のユーザーのみ削除可能
-    if user.department != current_user.department:
+    if target.department != current_user.department:
         flash("このユーザーを削除する権限がありません。", "error")
         return redirect(url_for("user_management.dashboard"))
 
     # 自分自身は削除できない
-    if user.id == current_user.id:
+    if target.id == current_user.id:
         flash("自分自身を削除することはできません。", "error")
         return redirect(url_for("user_management.dashboard"))
 
     try:
-        username = user.username
-        db.session.delete(user)
+        username = target.username
+        db.session.execute(delete(User).where(User.id == user_id))
         db.session.commit()
+        invalidate_user_list_cache()
 
         flash(f"{username}さんを削除しました。", "success")
     except Exception as e:
@@ -122,6 +211,7 @@ def delete_user(user_id):
 @user_management_bp.route("/toggle-user-management/<int:user_id>", methods=["POST"])
 @login_required
 @user_management_required
+@max_queries(3)
 def toggle_user_management(user_id):
     """
     ユーザーの管理権限を切り替える
@@ -132,24 +222,29 @@ def toggle_user_management(user_id):
     Returns:
         ユーザー管理ダッシュボードへのリダイレクト
     """
-    user = User.query.get_or_404(user_id)
+    target = get_target_user_row(user_id)
 
     # 同じ所属のユーザーのみ権限変更可能
-    if user.department != current_user.department:
+    if target.department != current_user.department:
         flash("このユーザーの権限を変更する権限がありません。", "error")
         return redirect(url_for("user_management.dashboard"))
 
     # 自分自身の権限は変更できない
-    if user.id == current_user.id:
+    if target.id == current_user.id:
         flash("自分自身の管理権限は変更できません。", "error")
         return redirect(url_for("user_management.dashboard"))
 
     try:
-        user.can_manage_users = not user.can_manage_users
+        # 読み込みと更新の間に他の管理者の変更が挟まらないよう、SQL側で反転する
+        db.session.execute(
+            update(User).where(User.id == user_id).values(can_manage_users=not_(User.can_manage_users))
+        )
+        can_manage_users = db.session.query(User.can_manage_users).filter_by(id=user_id).scalar()
         db.session.commit()
+        invalidate_user_list_cache()
 
-        status = "付与" if user.can_manage_users else "剥奪"
-        flash(f"{user.username}さんのユーザー管理権限を{status}しました。", "success")
+        status = "付与" if can_manage_users else "剥奪"
+        flash(f"{target.username}さんのユーザー管理権限を{status}しました。", "success")
     except Exception as e:
         db.session.rollback()
         flash(f"権限の変更中にエラーが発生しました: {e}", "error")
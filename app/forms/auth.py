@@ -4,11 +4,49 @@
 ログイン等の認証関連フォームを定義する。
 """
 
+import re
+
 from flask_wtf import FlaskForm
 from wtforms import StringField, PasswordField, SubmitField, SelectField, EmailField
 from wtforms.validators import DataRequired, Length, Email, EqualTo, ValidationError, Regexp
+from sqlalchemy import exists
+from app import db
 from app.models import User
 
+# パスワードの形式（英字と数字を両方含む8文字以上の半角英数字）。各フォームで共有する
+PASSWORD_PATTERN = re.compile(r"^(?=.*[0-9])(?=.*[a-zA-Z])[a-zA-Z0-9]{8,}$")
+
+
+class UniqueUserFieldsMixin:
+    """
+    ユーザー名・メールアドレスの重複チェックを行うフォーム用Mixin
+
+    usernameフィールドとemailフィールドを持つフォームで使用する。
+    """
+
+    _conflicts = None
+
+    def _fetch_conflicts(self, exclude_user_id=None):
+        """
+        入力されたメールアドレス・ユーザー名が既に使用されているかを取得する
+
+        ユーザー名とメールアドレスの重複チェックを1回のEXISTSクエリで行うため、結果はフォームに保持する。
+
+        Args:
+            exclude_user_id: 重複チェックの対象から除外するユーザーID（編集中のユーザー自身など）
+
+        Returns:
+            (メールアドレスが使用済みか, ユーザー名が使用済みか) のタプル
+        """
+        if self._conflicts is None:
+            email_query = exists().where(User.email == self.email.data)
+            username_query = exists().where(User.username == self.username.data)
+            if exclude_user_id is not None:
+                email_query = email_query.where(User.id != exclude_user_id)
+                username_query = username_query.where(User.id != exclude_user_id)
+            self._conflicts = db.session.query(email_query, username_query).one()
+        return self._conflicts
+
 
 class LoginForm(FlaskForm):
     """
@@ -62,7 +100,7 @@ class LoginForm(FlaskForm):
     )
 
 
-class RegisterForm(FlaskForm):
+class RegisterForm(UniqueUserFieldsMixin, FlaskForm):
     """
     新規登録フォーム
 
@@ -112,7 +150,7 @@ class RegisterForm(FlaskForm):
             DataRequired(message="パスワードを入力してください。"),
             Length(min=8, message="パスワードは8文字以上で入力してください。"),
             Regexp(
-                r"^(?=.*[0-9])(?=.*[a-zA-Z])[a-zA-Z0-9]{8,}$",
+                PASSWORD_PATTERN,
                 message="パスワードは英数字を組み合わせた8文字以上で入力してください。",
             ),
         ],
@@ -169,14 +207,12 @@ class RegisterForm(FlaskForm):
 
     def validate_username(self, username):
         """ユーザー名の重複チェック"""
-        user = User.query.filter_by(username=username.data).first()
-        if user:
+        if self._fetch_conflicts()[1]:
             raise ValidationError("このユーザー名は既に使用されています。")
 
     def validate_email(self, email):
         """メールアドレスの重複チェック"""
-        user = User.query.filter_by(email=email.data).first()
-        if user:
+        if self._fetch_conflicts()[0]:
             raise ValidationError("このメールアドレスは既に使用されています。")
 
 
@@ -228,7 +264,7 @@ class ResetPasswordForm(FlaskForm):
             DataRequired(message="新しいパスワードを入力してください。"),
             Length(min=8, message="パスワードは8文字以上で入力してください。"),
             Regexp(
-                r"^(?=.*[0-9])(?=.*[a-zA-Z])[a-zA-Z0-9]{8,}$",
+                PASSWORD_PATTERN,
                 message="パスワードは英数字を組み合わせた8文字以上で入力してください。",
             ),
         ],
@@ -266,10 +302,17 @@ class ResetPasswordForm(FlaskForm):
         },
     )
 
+    def __init__(self, *args, **kwargs):
+        """フォームを初期化する"""
+        super().__init__(*args, **kwargs)
+        self.user_id = None
+
     def validate_email(self, field):
         """
         メールアドレスとユーザー名の組み合わせを検証する
 
+        検証に成功した場合、該当ユーザーのIDをuser_id属性に保持する。
+
         Args:
             field: メールアドレスフィールド
 
@@ -278,6 +321,8 @@ class ResetPasswordForm(FlaskForm):
         """
         # ユーザー名とメールアドレスの両方が入力されている場合のみ検証
         if self.username.data and field.data:
-            user = User.query.filter_by(username=self.username.data, email=field.data).first()
-            if not user:
+            self.user_id = (
+                db.session.query(User.id).filter_by(username=self.username.data, email=field.data).scalar()
+            )
+            if self.user_id is None:
                 raise ValidationError("ユーザー名とメールアドレスの組み合わせが正しくありません。")
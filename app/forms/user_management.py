@@ -7,10 +7,10 @@
 from flask_wtf import FlaskForm
 from wtforms import StringField, PasswordField, SelectField, SubmitField
 from wtforms.validators import DataRequired, Length, Email, Optional, Regexp, ValidationError
-from app.models import User
+from app.forms.auth import PASSWORD_PATTERN, UniqueUserFieldsMixin
 
 
-class EditUserForm(FlaskForm):
+class EditUserForm(UniqueUserFieldsMixin, FlaskForm):
     """
     ユーザー編集フォーム
 
@@ -76,7 +76,7 @@ class EditUserForm(FlaskForm):
             Optional(),
             Length(min=8, message="パスワードは8文字以上で入力してください。"),
             Regexp(
-                r"^(?=.*[0-9])(?=.*[a-zA-Z])[a-zA-Z0-9]{8,}$",
+                PASSWORD_PATTERN,
                 message="パスワードは英数字を組み合わせた8文字以上で入力してください。",
             ),
         ],
@@ -103,6 +103,7 @@ class EditUserForm(FlaskForm):
     def __init__(self, *args, **kwargs):
         """フォームを初期化する"""
         super().__init__(*args, **kwargs)
+        self.user_id = None
         self.original_email = None
         self.original_username = None
 
@@ -119,8 +120,7 @@ class EditUserForm(FlaskForm):
         if self.original_email and field.data == self.original_email:
             return
 
-        user = User.query.filter_by(email=field.data).first()
-        if user:
+        if self._fetch_conflicts(self.user_id)[0]:
             raise ValidationError("このメールアドレスは既に使用されています。")
 
     def validate_username(self, field):
@@ -136,6 +136,5 @@ class EditUserForm(FlaskForm):
         if self.original_username and field.data == self.original_username:
             return
 
-        user = User.query.filter_by(username=field.data).first()
-        if user:
+        if self._fetch_conflicts(self.user_id)[1]:
             raise ValidationError("このユーザー名は既に使用されています。")
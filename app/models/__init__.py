@@ -6,6 +6,9 @@
 
 from app.models.pos_sales import PosSales
 from app.models.daily_sales import DailySales
+from app.models.daily_product_sales import DailyProductSales
+from app.models.pdf_upload import PdfUpload
+from app.models.pos_upload_job import PosUploadJob
 from app.models.user import User
 from app.models.settlement_history import SettlementHistory
 from app.models.program import ExperienceProgram
@@ -14,6 +17,9 @@ from app.models.reservation import Reservation
 __all__ = [
     "PosSales",
     "DailySales",
+    "DailyProductSales",
+    "PdfUpload",
+    "PosUploadJob",
     "User",
     "SettlementHistory",
     "ExperienceProgram",
@@ -0,0 +1,43 @@
+"""
+日次商品別売上集計データモデル
+
+pos_salesテーブルのデータを日別・商品別で集計した結果を保存するテーブル。
+"""
+
+from app import db
+
+
+class DailyProductSales(db.Model):
+    """
+    日次商品別売上集計データテーブル
+
+    pos_salesテーブルのデータを営業日・商品ごとに集計した結果を保存する。
+    集計結果画面の表示時に毎回集計し直さないための事前集計テーブル。
+
+    Attributes:
+        id: 主キー（自動採番）
+        sale_date: 売上日 (YYYY-MM-DD)
+        product_code: 商品コード
+        product_name: 商品名
+        total_quantity: 合計数量
+        total_subtotal: 合計金額
+
+    Indexes:
+        idx_daily_product_sales_date_code: sale_dateとproduct_codeの複合インデックス
+    """
+
+    __tablename__ = "daily_product_sales"
+
+    id = db.Column(db.Integer, primary_key=True, autoincrement=True)
+    sale_date = db.Column(db.String, nullable=False, comment="売上日 (YYYY-MM-DD)")
+    product_code = db.Column(db.String, nullable=False, comment="商品コード")
+    product_name = db.Column(db.String, nullable=False, comment="商品名")
+    total_quantity = db.Column(db.Integer, nullable=False, comment="合計数量")
+    total_subtotal = db.Column(db.Integer, nullable=False, comment="合計金額")
+
+    # 営業日で検索し、商品コードでソートするクエリを高速化
+    __table_args__ = (db.Index("idx_daily_product_sales_date_code", "sale_date", "product_code"),)
+
+    def __repr__(self) -> str:
+        """オブジェクトの文字列表現を返す"""
+        return f"<DailyProductSales {self.sale_date} {self.product_code}: {self.total_subtotal}>"
@@ -4,7 +4,6 @@
 pos_salesテーブルのデータを日別・商品別で集計した結果を保存するテーブル。
 """
 
-from datetime import datetime
 from app import db
 
 
@@ -32,7 +31,7 @@ class DailySales(db.Model):
     id = db.Column(db.Integer, primary_key=True, autoincrement=True)
     sale_date = db.Column(db.String, nullable=False, comment="売上日 (YYYY-MM-DD)")
     total_sales_amount = db.Column(db.Integer, nullable=False, comment="日次合計売上")
-    created_at = db.Column(db.DateTime, default=datetime.utcnow, nullable=False, comment="集計日時")
+    created_at = db.Column(db.DateTime, server_default=db.func.now(), nullable=False, comment="集計日時")
 
     # 複合インデックスの定義
     # sale_dateで検索し、created_atでソートするクエリを高速化
@@ -0,0 +1,40 @@
+"""
+POSレポートPDF取込履歴モデル
+
+取り込み済みのPDFをファイル内容のハッシュ値で管理するテーブル。
+"""
+
+from app import db
+
+
+class PdfUpload(db.Model):
+    """
+    POSレポートPDF取込履歴テーブル
+
+    取り込んだPDFのSHA-256ハッシュ値を保存し、同じPDFの再解析・再取込を防ぐ。
+
+    Attributes:
+        sha256: PDFファイル内容のSHA-256ハッシュ値（主キー）
+        filename: アップロード時のファイル名
+        pos_number: POSレジ番号
+        sale_date: 売上日 (YYYY-MM-DD)
+        uploaded_at: 取込日時（自動設定）
+
+    Indexes:
+        idx_pdf_uploads_date_pos: sale_dateとpos_numberの複合インデックス
+    """
+
+    __tablename__ = "pdf_uploads"
+
+    sha256 = db.Column(db.String(64), primary_key=True, comment="PDFファイル内容のSHA-256ハッシュ値")
+    filename = db.Column(db.String, nullable=False, comment="アップロード時のファイル名")
+    pos_number = db.Column(db.String, nullable=False, comment="POSレジ番号")
+    sale_date = db.Column(db.String, nullable=False, comment="売上日 (YYYY-MM-DD)")
+    uploaded_at = db.Column(db.DateTime, server_default=db.func.now(), nullable=False, comment="取込日時")
+
+    # POSデータ削除時に取込履歴も削除するためのインデックス
+    __table_args__ = (db.Index("idx_pdf_uploads_date_pos", "sale_date", "pos_number"),)
+
+    def __repr__(self) -> str:
+        """オブジェクトの文字列表現を返す"""
+        return f"<PdfUpload {self.sha256[:12]}: {self.filename}>"
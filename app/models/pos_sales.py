@@ -4,7 +4,6 @@ POS売上データモデル
 PDFから抽出した明細レベルの生データを保存するテーブル。
 """
 
-from datetime import datetime
 from app import db
 
 
@@ -31,6 +30,8 @@ class PosSales(db.Model):
 
     Indexes:
         idx_pos_sales_date: sale_date、pos_number、product_codeの複合インデックス
+        idx_pos_sales_date_product: sale_date、product_code、product_name、quantity、subtotalの複合インデックス
+            （日次・商品別集計をテーブル本体を読まずにインデックスのみで処理するため）
     """
 
     __tablename__ = "pos_sales"
@@ -46,10 +47,13 @@ class PosSales(db.Model):
     subtotal = db.Column(db.Integer, nullable=False, comment="合計金額 (数量 * 単価)")
     total_amount = db.Column(db.Integer, nullable=False, comment="POSレジ総合計金額")
     pdf_source_file = db.Column(db.String, nullable=True, comment="読み込み元PDFファイル名")
-    registration_date = db.Column(db.DateTime, default=datetime.utcnow, nullable=False, comment="登録日時")
+    registration_date = db.Column(db.DateTime, server_default=db.func.now(), nullable=False, comment="登録日時")
 
     # インデックスの定義（データ量が多い場合に備える）
-    __table_args__ = (db.Index("idx_pos_sales_date", "sale_date", "pos_number", "product_code"),)
+    __table_args__ = (
+        db.Index("idx_pos_sales_date", "sale_date", "pos_number", "product_code"),
+        db.Index("idx_pos_sales_date_product", "sale_date", "product_code", "product_name", "quantity", "subtotal"),
+    )
 
     def __repr__(self) -> str:
         """オブジェクトの文字列表現を返す"""
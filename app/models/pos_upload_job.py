@@ -0,0 +1,43 @@
+"""
+POSレポートPDF取込ジョブモデル
+
+バックグラウンドで実行するPDF取込ジョブの状態と結果を管理するテーブル。
+"""
+
+from app import db
+
+
+class PosUploadJob(db.Model):
+    """
+    POSレポートPDF取込ジョブテーブル
+
+    ジョブの状態をDBに保存し、どのワーカープロセスからでも進捗を確認できるようにする。
+
+    Attributes:
+        id: ジョブID（UUIDの16進文字列、主キー）
+        status: ジョブの状態（queued / running / finished）
+        summary: 取込結果（完了時に設定）
+        created_at: 登録日時（自動設定）
+        updated_at: 状態の更新日時
+    """
+
+    __tablename__ = "pos_upload_jobs"
+
+    id = db.Column(db.String(32), primary_key=True, comment="ジョブID")
+    status = db.Column(db.String, nullable=False, default="queued", comment="ジョブの状態")
+    summary = db.Column(db.JSON, nullable=True, comment="取込結果")
+    created_at = db.Column(db.DateTime, server_default=db.func.now(), nullable=False, comment="登録日時")
+    updated_at = db.Column(
+        db.DateTime,
+        server_default=db.func.now(),
+        onupdate=db.func.now(),
+        nullable=False,
+        comment="状態の更新日時",
+    )
+
+    # 古いジョブを削除するためのインデックス
+    __table_args__ = (db.Index("idx_pos_upload_jobs_created_at", "created_at"),)
+
+    def __repr__(self) -> str:
+        """オブジェクトの文字列表現を返す"""
+        return f"<PosUploadJob {self.id}: {self.status}>"
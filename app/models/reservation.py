@@ -19,6 +19,13 @@ class Reservation(db.Model):
 
     program = db.relationship('ExperienceProgram', backref=db.backref('reservations', lazy=True, cascade="all, delete-orphan"))
 
+    # 定員チェック（program_id・reservation_dateの一致）とプログラム削除時の予約件数確認で使用するインデックス、
+    # およびカレンダーの期間指定（reservation_dateの範囲）と予約一覧の日付順の並び替えで使用するインデックス
+    __table_args__ = (
+        db.Index('idx_reservations_program_date', 'program_id', 'reservation_date'),
+        db.Index('idx_reservations_date', 'reservation_date'),
+    )
+
     def __repr__(self):
         return f'<Reservation {self.name} for program_id={self.program_id}>'
 
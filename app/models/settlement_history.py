@@ -4,7 +4,6 @@
 精算書の一括生成・ダウンロード履歴を管理する。
 """
 
-from datetime import datetime
 from app import db
 
 
@@ -32,13 +31,11 @@ class SettlementHistory(db.Model):
     file_name = db.Column(db.String(255), nullable=False, comment="ファイル名")
     file_path = db.Column(db.String(500), nullable=False, comment="ファイル保存パス")
     file_format = db.Column(db.String(10), nullable=False, default="excel", comment="ファイル形式")
-    created_at = db.Column(db.DateTime, default=datetime.utcnow, nullable=False, comment="発行日時")
+    created_at = db.Column(db.DateTime, server_default=db.func.now(), nullable=False, comment="発行日時")
 
     # インデックスの定義
-    __table_args__ = (
-        db.Index("idx_settlement_history_year_month", "year", "month"),
-        db.Index("idx_settlement_history_created_at", "created_at"),
-    )
+    # （履歴一覧は発行日時順に取得するため、created_atのインデックスのみを持つ）
+    __table_args__ = (db.Index("idx_settlement_history_created_at", "created_at"),)
 
     def __repr__(self) -> str:
         """オブジェクトの文字列表現を返す"""
@@ -53,7 +50,8 @@ class SettlementHistory(db.Model):
             "file_name": self.file_name,
             "file_path": self.file_path,
             "file_format": self.file_format,
-            "created_at": self.created_at.strftime("%Y-%m-%d %H:%M:%S"),
+            # strftimeと同じ"YYYY-MM-DD HH:MM:SS"形式（書式文字列の解釈が不要なisoformatを使用）
+            "created_at": self.created_at.isoformat(sep=" ", timespec="seconds"),
         }
 
 
@@ -5,7 +5,6 @@
 ユーザー認証・認可の基盤として機能する。
 """
 
-from datetime import datetime
 from flask_login import UserMixin
 from app import db
 
@@ -25,6 +24,9 @@ class User(UserMixin, db.Model):
         hashed_password: ハッシュ化されたパスワード
         can_manage_users: ユーザー管理権限（デフォルト: False）
         created_at: 登録日時（自動設定）
+
+    Indexes:
+        idx_users_department_id: department、idの複合インデックス（所属別ユーザー一覧の取得用）
     """
 
     __tablename__ = "users"
@@ -35,7 +37,9 @@ class User(UserMixin, db.Model):
     department = db.Column(db.String(50), nullable=False, comment="所属")
     hashed_password = db.Column(db.String(255), nullable=False, comment="ハッシュ化されたパスワード")
     can_manage_users = db.Column(db.Boolean, default=False, nullable=False, comment="ユーザー管理権限")
-    created_at = db.Column(db.DateTime, default=datetime.utcnow, nullable=False, comment="登録日時")
+    created_at = db.Column(db.DateTime, server_default=db.func.now(), nullable=False, comment="登録日時")
+
+    __table_args__ = (db.Index("idx_users_department_id", "department", "id"),)
 
     def __repr__(self) -> str:
         """オブジェクトの文字列表現を返す"""
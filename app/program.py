@@ -7,6 +7,8 @@ from flask import Blueprint, render_template, redirect, url_for, flash, abort, r
 from .models import ExperienceProgram, Reservation
 from .forms import ExperienceProgramForm
 from . import db
+from .reservation import invalidate_program_cache
+from sqlalchemy.exc import IntegrityError
 
 program_bp = Blueprint('program', __name__)
 
@@ -25,12 +27,6 @@ def create():
     
     if form.validate_on_submit():
         try:
-            # プログラム名の重複チェック
-            existing_program = ExperienceProgram.query.filter_by(name=form.name.data).first()
-            if existing_program:
-                flash('このプログラム名は既に登録されています。', 'error')
-                return render_template('programs/create.html', form=form)
-            
             program = ExperienceProgram(
                 name=form.name.data,
                 description=form.description.data,
@@ -40,10 +36,15 @@ def create():
             
             db.session.add(program)
             db.session.commit()
+            invalidate_program_cache()
             
             flash('体験プログラムを登録しました。', 'success')
             return redirect(url_for('program.index'))
             
+        except IntegrityError:
+            # プログラム名の重複はname列の一意制約で検出する
+            db.session.rollback()
+            flash('このプログラム名は既に登録されています。', 'error')
         except Exception as e:
             db.session.rollback()
             flash(f'体験プログラムの登録中にエラーが発生しました: {str(e)[:100]}', 'error')
@@ -62,15 +63,6 @@ def edit(id):
     
     if form.validate_on_submit():
         try:
-            # プログラム名の重複チェック（自分自身を除く）
-            existing_program = ExperienceProgram.query.filter(
-                ExperienceProgram.name == form.name.data,
-                ExperienceProgram.id != id
-            ).first()
-            if existing_program:
-                flash('このプログラム名は既に登録されています。', 'error')
-                return render_template('programs/edit.html', form=form, program=program)
-            
             # プログラム情報を更新
             program.name = form.name.data
             program.description = form.description.data
@@ -78,10 +70,15 @@ def edit(id):
             program.capacity = form.capacity.data
             
             db.session.commit()
+            invalidate_program_cache()
             
             flash('体験プログラムを更新しました。', 'success')
             return redirect(url_for('program.index'))
             
+        except IntegrityError:
+            # プログラム名の重複（自分以外のプログラムと同名）はname列の一意制約で検出する
+            db.session.rollback()
+            flash('このプログラム名は既に登録されています。', 'error')
         except Exception as e:
             db.session.rollback()
             flash(f'体験プログラムの更新中にエラーが発生しました: {str(e)[:100]}', 'error')
@@ -97,14 +94,17 @@ def delete(id):
         abort(404)
     
     try:
-        # 関連する予約があるかチェック
-        reservations = Reservation.query.filter_by(program_id=id).count()
-        if reservations > 0:
+        # 関連する予約があるかチェック（最初の1件が見つかった時点で終わるEXISTSで確認し、
+        # 削除できない場合のみメッセージ用に件数を数える）
+        has_reservations = db.session.query(db.exists().where(Reservation.program_id == id)).scalar()
+        if has_reservations:
+            reservations = Reservation.query.filter_by(program_id=id).count()
             flash(f'このプログラムには{reservations}件の予約が登録されているため、削除できません。', 'error')
             return redirect(url_for('program.index'))
         
         db.session.delete(program)
         db.session.commit()
+        invalidate_program_cache()
         flash('体験プログラムを削除しました。', 'success')
     except Exception as e:
         db.session.rollback()
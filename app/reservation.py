@@ -3,15 +3,188 @@
 
 予約のCRUD機能を提供するBlueprint
 """
-from datetime import date, timedelta, datetime
+import time
+from datetime import date
+from typing import NamedTuple
 from flask import Blueprint, render_template, redirect, url_for, flash, abort, jsonify, request, current_app, session
-from .models import ExperienceProgram, Reservation # ReservationFormのインポートを削除
-from .forms import ReservationForm # 新しくforms.pyからインポート
+from .models import ExperienceProgram, Reservation
+from .forms import ReservationForm
 from . import db
+from .utils.decorators import max_queries
 from sqlalchemy import func
 
 reservation_bp = Blueprint('reservation', __name__)
 
+# カレンダー表示でプログラム名を短縮する際のキーワード（先に一致したものを使う）
+CALENDAR_SHORT_NAMES = ('ハンカチ', '天然藍')
+
+# カレンダーのイベント表示スタイル（背景色, 枠線色, classNames）。全イベントで共有する
+EVENT_STYLE_PAST = ('#d1d5db', '#d1d5db', ('cursor-not-allowed',))  # 薄グレー（過去の日程）
+EVENT_STYLE_FULL = ('#ef4444', '#ef4444', ('cursor-not-allowed',))  # 赤（満席）
+EVENT_STYLE_AVAILABLE = ('#22c55e', '#22c55e', ('cursor-pointer',))  # 緑（予約が入っていて余裕がある）
+
+# 体験プログラム（ID・名前・定員）の一覧をキャッシュする秒数
+# キャッシュはプロセスごとに保持し、invalidate_program_cache()も呼び出したプロセスのキャッシュしか破棄しない。
+# 複数ワーカーで動かす場合、他のワーカーではプログラムの追加・変更がこの秒数だけ遅れて反映される
+PROGRAM_CACHE_TIMEOUT = 60
+_program_cache = {}
+
+# カレンダー用の予約人数集計をキャッシュする秒数
+# キャッシュはプロセスごとに保持し、invalidate_reservation_count_cache()も呼び出したプロセスのキャッシュしか破棄しない。
+# 複数ワーカーで動かす場合、他のワーカーのカレンダーでは空き状況がこの秒数だけ遅れて反映される
+# （定員の判定はキャッシュを使わず、予約登録時にDB上で行う）
+EVENTS_CACHE_TIMEOUT = 60
+_reservation_count_cache = {}
+
+
+class ProgramRow(NamedTuple):
+    """予約フォームの選択肢やカレンダー表示に使う体験プログラム1件分"""
+
+    id: int
+    name: str
+    capacity: int
+
+
+def invalidate_program_cache():
+    """
+    体験プログラム一覧のキャッシュを破棄する
+
+    体験プログラムの登録・更新・削除後に呼び出す。
+    """
+    _program_cache.clear()
+
+
+def get_programs():
+    """
+    体験プログラムのID・名前・定員をIDの昇順で取得する
+
+    体験プログラムは管理画面からしか変更されないため、
+    結果をPROGRAM_CACHE_TIMEOUT秒間キャッシュする。
+
+    Returns:
+        ProgramRowのリスト
+    """
+    cached = _program_cache.get('programs')
+    if cached and time.monotonic() - cached[0] < PROGRAM_CACHE_TIMEOUT:
+        return cached[1]
+
+    rows = db.session.execute(
+        db.select(ExperienceProgram.id, ExperienceProgram.name, ExperienceProgram.capacity)
+        .order_by(ExperienceProgram.id)
+    )
+    programs = [ProgramRow(*row) for row in rows]
+    _program_cache['programs'] = (time.monotonic(), programs)
+    return programs
+
+
+def get_program_choices():
+    """予約フォームの体験プログラムの選択肢（ID, プログラム名）を取得する"""
+    return [(p.id, p.name) for p in get_programs()]
+
+
+def invalidate_reservation_count_cache():
+    """
+    カレンダー用の予約人数集計のキャッシュを破棄する
+
+    予約の作成・更新・削除後に呼び出す。
+    """
+    _reservation_count_cache.clear()
+
+
+def get_reservation_counts(start_date, end_date):
+    """
+    期間内のプログラム・日付ごとの予約人数の合計を取得する
+
+    カレンダーでは続けて次の月が表示されることが多いため、集計時には
+    同じ長さの翌期間もまとめて集計し、EVENTS_CACHE_TIMEOUT秒間キャッシュする。
+    キャッシュした期間に含まれる範囲の要求にはクエリを発行せずに応答する。
+
+    Args:
+        start_date: 期間の開始日
+        end_date: 期間の終了日（この日を含む）
+
+    Returns:
+        dict: (プログラムID, 予約日) をキー、予約人数の合計を値とする辞書
+    """
+    cached = _reservation_count_cache.get('window')
+    if cached and time.monotonic() - cached[0] < EVENTS_CACHE_TIMEOUT:
+        _, window_start, window_end, counts = cached
+        if window_start <= start_date and end_date <= window_end:
+            return {key: total for key, total in counts.items() if start_date <= key[1] <= end_date}
+
+    window_end = end_date + (end_date - start_date)
+    rows = db.session.query(
+        Reservation.program_id,
+        Reservation.reservation_date,
+        func.sum(Reservation.number_of_participants).label('total_participants')
+    ).filter(
+        Reservation.reservation_date.between(start_date, window_end)
+    ).group_by(
+        Reservation.program_id,
+        Reservation.reservation_date
+    ).all()
+
+    counts = {(r.program_id, r.reservation_date): r.total_participants for r in rows}
+    _reservation_count_cache['window'] = (time.monotonic(), start_date, window_end, counts)
+    return {key: total for key, total in counts.items() if key[1] <= end_date}
+
+
+def get_booked_participants(program_id, reservation_date, exclude_id=None):
+    """
+    指定したプログラム・日付の予約済み参加人数の合計を取得する
+
+    Args:
+        program_id: 体験プログラムのID
+        reservation_date: 予約日
+        exclude_id: 集計から除外する予約ID（編集時の自分自身）
+
+    Returns:
+        int: 予約済み参加人数の合計（予約がない場合は0）
+    """
+    query = db.session.query(
+        func.coalesce(func.sum(Reservation.number_of_participants), 0)
+    ).filter(
+        Reservation.program_id == program_id,
+        Reservation.reservation_date == reservation_date
+    )
+    if exclude_id is not None:
+        query = query.filter(Reservation.id != exclude_id)
+    return query.scalar()
+
+
+def insert_reservation_within_capacity(**values):
+    """
+    定員を超えない場合のみ予約を登録する
+
+    定員の取得・予約済み人数の集計・登録を1つのINSERT ... SELECT ... WHERE文で行うため、
+    DBとの往復は1回で済み、同時に確定された予約との間で定員を超える登録
+    （オーバーブッキング）も起きない。
+
+    Args:
+        **values: 予約の各列の値（program_id, name, email, phone_number,
+                  reservation_date, number_of_participants）
+
+    Returns:
+        bool: 登録できた場合はTrue、定員を超える（またはプログラムが存在しない）ため
+              登録しなかった場合はFalse
+    """
+    columns = list(values)
+    capacity = db.select(ExperienceProgram.capacity).where(
+        ExperienceProgram.id == values['program_id']
+    ).scalar_subquery()
+    booked = db.select(
+        func.coalesce(func.sum(Reservation.number_of_participants), 0)
+    ).where(
+        Reservation.program_id == values['program_id'],
+        Reservation.reservation_date == values['reservation_date']
+    ).scalar_subquery()
+    source = db.select(
+        *[db.literal(values[column], Reservation.__table__.c[column].type) for column in columns]
+    ).where(booked + values['number_of_participants'] <= capacity)
+    result = db.session.execute(db.insert(Reservation).from_select(columns, source))
+    return result.rowcount == 1
+
+
 @reservation_bp.route('/')
 def index():
     """体験プログラムの一覧を表示する"""
@@ -19,19 +192,34 @@ def index():
     return render_template('index.html', programs=programs)
 
 
+def _render_create_form(form, program, today_date):
+    """
+    予約入力画面を表示する（初回表示・入力エラー時の再表示で共通）
+
+    フォームの選択肢は呼び出し元で設定済みのものをそのまま使う。
+
+    Args:
+        form: 予約フォーム
+        program: カレンダーから指定された体験プログラム（指定なしの場合はNone）
+        today_date: 今日の日付（YYYY-MM-DD形式、日付入力の下限に使用）
+
+    Returns:
+        予約入力画面のレスポンス
+    """
+    return render_template('reservations/create.html', form=form, program=program, today_date=today_date)
+
+
 @reservation_bp.route('/create', methods=['GET', 'POST'], defaults={'program_id': None})
 @reservation_bp.route('/create/<int:program_id>', methods=['GET', 'POST'])
 def create(program_id=None):
     """予約を作成する"""
+    # 今日の日付（テンプレート用）、指定されたプログラム、選択肢はここで1回だけ取得し、
+    # エラー時のフォーム再表示でもそのまま使う
+    today_date = date.today().isoformat()
+    program = db.session.get(ExperienceProgram, program_id) if program_id else None
+    program_choices = get_program_choices()
+    
     try:
-        # 今日の日付を取得（テンプレート用）
-        today_date = date.today().isoformat()
-        
-        program = db.session.get(ExperienceProgram, program_id) if program_id else None
-        
-        # 体験プログラムの選択肢を準備
-        program_choices = [(p.id, p.name) for p in ExperienceProgram.query.all()]
-        
         # フォームを作成
         form = ReservationForm()
         form.program_id.choices = program_choices
@@ -52,7 +240,7 @@ def create(program_id=None):
                 date_str = request.args.get('date')
                 try:
                     # 日付文字列をDateオブジェクトに変換
-                    date_obj = datetime.strptime(date_str, '%Y-%m-%d').date()
+                    date_obj = date.fromisoformat(date_str)
                     form.reservation_date.data = date_obj
                 except (ValueError, TypeError) as e:
                     flash('日付の形式が正しくありません。', 'error')
@@ -66,10 +254,8 @@ def create(program_id=None):
             # フォームのバリデーションを実行（1回だけ）
             try:
                 is_valid = form.validate_on_submit()
-            except Exception as e:
-                print(f'[ERROR] バリデーション実行中にエラー: {str(e)}')
-                import traceback
-                print(traceback.format_exc())
+            except Exception:
+                current_app.logger.exception('バリデーション実行中にエラーが発生しました')
                 is_valid = False
         
         if is_valid:
@@ -77,32 +263,24 @@ def create(program_id=None):
                 # 予約日が今日以降であることを確認
                 if form.reservation_date.data and form.reservation_date.data < date.today():
                     flash('日程が過ぎているので予約の受付が出来ません。', 'info')
-                    form.program_id.choices = [(p.id, p.name) for p in ExperienceProgram.query.all()]
-                    return render_template('reservations/create.html', form=form, program=program, today_date=today_date)
+                    return _render_create_form(form, program, today_date)
                 
                 # フォームから送信されたprogram_idでプログラムを再取得
                 # hiddenフィールドからの値も考慮する
                 selected_program_id = form.program_id.data or request.form.get('program_id', type=int) or program_id
                 if not selected_program_id:
                     flash('プログラムを選択してください。', 'error')
-                    form.program_id.choices = [(p.id, p.name) for p in ExperienceProgram.query.all()]
-                    return render_template('reservations/create.html', form=form, program=program, today_date=today_date)
+                    return _render_create_form(form, program, today_date)
                 
                 selected_program = db.session.get(ExperienceProgram, selected_program_id)
                 if not selected_program:
                     flash('指定された体験プログラムが見つかりません。', 'error')
-                    form.program_id.choices = [(p.id, p.name) for p in ExperienceProgram.query.all()]
-                    return render_template('reservations/create.html', form=form, program=program, today_date=today_date)
+                    return _render_create_form(form, program, today_date)
                 # 定員チェック
-                existing_reservations = Reservation.query.filter_by(
-                    program_id=selected_program_id,
-                    reservation_date=form.reservation_date.data
-                ).all()
-                
-                total_participants = sum(r.number_of_participants for r in existing_reservations)
+                total_participants = get_booked_participants(selected_program_id, form.reservation_date.data)
                 if total_participants + form.number_of_participants.data > selected_program.capacity:
                     flash(f'この日の予約が満席です。（残り: {selected_program.capacity - total_participants}名）', 'error')
-                    return render_template('reservations/create.html', form=form, program=program, today_date=today_date)
+                    return _render_create_form(form, program, today_date)
                 
                 # 確認画面にリダイレクト（セッションにデータを保存）
                 session['reservation_data'] = {
@@ -117,15 +295,9 @@ def create(program_id=None):
                 
             except Exception as e:
                 db.session.rollback()
-                import traceback
                 error_msg = str(e)
-                error_traceback = traceback.format_exc()
-                # ログに詳細なエラー情報を出力
-                current_app.logger.error(f'予約作成エラー: {error_msg}')
-                current_app.logger.error(error_traceback)
-                # コンソールにも出力（開発時）
-                print(f'[ERROR] 予約作成エラー: {error_msg}')
-                print(f'[ERROR] トレースバック:\n{error_traceback}')
+                # ログに詳細なエラー情報（トレースバック付き）を出力
+                current_app.logger.exception('予約作成エラー: %s', error_msg)
                 # エラーメッセージが長すぎる場合は短縮
                 if len(error_msg) > 100:
                     error_msg = error_msg[:100] + '...'
@@ -149,29 +321,19 @@ def create(program_id=None):
                     for error in errors:
                         flash(f'{field_name}: {error}', 'error')
         
-        # フォームの選択肢を再設定（エラー時にも必要）
-        form.program_id.choices = [(p.id, p.name) for p in ExperienceProgram.query.all()]
-        
-        return render_template('reservations/create.html', form=form, program=program, today_date=today_date)
+        return _render_create_form(form, program, today_date)
     
     except Exception as e:
         # 予期しないエラーをキャッチ
-        import traceback
         error_msg = str(e)
-        error_traceback = traceback.format_exc()
-        current_app.logger.error(f'予約フォーム表示エラー: {error_msg}')
-        current_app.logger.error(error_traceback)
-        print(f'[ERROR] 予約フォーム表示エラー: {error_msg}')
-        print(f'[ERROR] トレースバック:\n{error_traceback}')
+        current_app.logger.exception('予約フォーム表示エラー: %s', error_msg)
         flash(f'エラーが発生しました: {error_msg[:100]}', 'error')
-        # エラー時でもフォームを表示できるようにする
+        # エラー時でもフォームを表示できるようにする（取得済みの値を使い、DBには再アクセスしない）
         try:
             form = ReservationForm()
-            form.program_id.choices = [(p.id, p.name) for p in ExperienceProgram.query.all()]
-            program = db.session.get(ExperienceProgram, program_id) if program_id else None
-            today_date = date.today().isoformat()
-            return render_template('reservations/create.html', form=form, program=program, today_date=today_date)
-        except:
+            form.program_id.choices = program_choices
+            return _render_create_form(form, program, today_date)
+        except Exception:
             # フォームも作成できない場合は、エラーページを返す
             abort(500)
 
@@ -185,22 +347,11 @@ def confirm():
         flash('予約情報が見つかりません。最初からやり直してください。', 'error')
         return redirect(url_for('reservation.index'))
     
-    # プログラム情報を取得
-    program = db.session.get(ExperienceProgram, reservation_data['program_id'])
-    if not program:
-        flash('体験プログラムが見つかりません。', 'error')
-        session.pop('reservation_data', None)
-        return redirect(url_for('reservation.index'))
-    
-    # フォームを作成（編集可能にするため）
-    form = ReservationForm()
-    form.program_id.choices = [(p.id, p.name) for p in ExperienceProgram.query.all()]
-    
     # 日付オブジェクトを作成（テンプレート用）
     reservation_date_obj = None
     try:
         if isinstance(reservation_data['reservation_date'], str):
-            reservation_date_obj = datetime.fromisoformat(reservation_data['reservation_date']).date()
+            reservation_date_obj = date.fromisoformat(reservation_data['reservation_date'])
         else:
             reservation_date_obj = reservation_data['reservation_date']
     except (ValueError, KeyError):
@@ -212,110 +363,68 @@ def confirm():
         try:
             # セッションデータから値を取得
             program_id = reservation_data['program_id']
-            name = reservation_data['name']
-            email = reservation_data['email']
-            phone_number = reservation_data['phone_number']
-            reservation_date_str = reservation_data['reservation_date']
-            number_of_participants = reservation_data['number_of_participants']
-            
-            # 日付を変換
-            if isinstance(reservation_date_str, str):
-                reservation_date = datetime.fromisoformat(reservation_date_str).date()
-            else:
-                reservation_date = reservation_date_str
-            
-            # プログラムを再取得
-            selected_program = db.session.get(ExperienceProgram, program_id)
-            if not selected_program:
-                flash('指定された体験プログラムが見つかりません。', 'error')
-                return render_template('reservations/confirm.html', 
-                                     form=form, 
-                                     program=program,
-                                     reservation_data=reservation_data,
-                                     reservation_date_obj=reservation_date_obj)
             
-            # 定員チェック
-            existing_reservations = Reservation.query.filter_by(
-                program_id=program_id,
-                reservation_date=reservation_date
-            ).all()
-            
-            total_participants = sum(r.number_of_participants for r in existing_reservations)
-            if total_participants + number_of_participants > selected_program.capacity:
-                flash(f'この日の予約が満席です。（残り: {selected_program.capacity - total_participants}名）', 'error')
-                return render_template('reservations/confirm.html', 
-                                     form=form, 
-                                     program=selected_program,
-                                     reservation_data=reservation_data,
-                                     reservation_date_obj=reservation_date_obj)
+            # 日付は先頭で変換済みのものを使う（変換できなかった場合はエラーとして扱う）
+            if reservation_date_obj is None:
+                raise ValueError('予約日の形式が正しくありません。')
+            reservation_date = reservation_date_obj
             
-            # 予約を作成
-            reservation = Reservation(
+            # 定員チェックと予約の作成（定員の取得も含めて1文で行う）
+            created = insert_reservation_within_capacity(
                 program_id=program_id,
-                name=name,
-                email=email,
-                phone_number=phone_number,
+                name=reservation_data['name'],
+                email=reservation_data['email'],
+                phone_number=reservation_data['phone_number'],
                 reservation_date=reservation_date,
-                number_of_participants=number_of_participants
+                number_of_participants=reservation_data['number_of_participants']
             )
+            if created:
+                db.session.commit()
+                invalidate_reservation_count_cache()
+                
+                # セッションをクリア
+                session.pop('reservation_data', None)
+                
+                flash('予約が完了しました。', 'success')
+                return redirect(url_for('reservation.index'))
             
-            db.session.add(reservation)
-            db.session.commit()
-            
-            # セッションをクリア
-            session.pop('reservation_data', None)
-            
-            flash('予約が完了しました。', 'success')
-            return redirect(url_for('reservation.index'))
+            # 登録できなかった場合のみプログラムを取得し、満席であれば残り人数を表示する
+            # （プログラムが存在しない場合は下の共通処理で予約トップへ戻す）
+            db.session.rollback()
+            selected_program = db.session.get(ExperienceProgram, program_id)
+            if selected_program:
+                total_participants = get_booked_participants(program_id, reservation_date)
+                flash(f'この日の予約が満席です。（残り: {selected_program.capacity - total_participants}名）', 'error')
             
         except Exception as e:
             db.session.rollback()
-            import traceback
             error_msg = str(e)
-            current_app.logger.error(f'予約作成エラー: {error_msg}')
-            current_app.logger.error(traceback.format_exc())
+            current_app.logger.exception('予約作成エラー: %s', error_msg)
             flash(f'予約の作成中にエラーが発生しました: {error_msg[:100]}', 'error')
-            # エラー時は確認画面を再表示
-            return render_template('reservations/confirm.html', 
-                                 form=form, 
-                                 program=program,
-                                 reservation_data=reservation_data,
-                                 reservation_date_obj=reservation_date_obj)
     
-    # セッションデータをフォームに設定（表示用）
-    form.program_id.data = reservation_data['program_id']
-    form.name.data = reservation_data['name']
-    form.email.data = reservation_data['email']
-    form.phone_number.data = reservation_data['phone_number']
-    form.reservation_date.data = reservation_date_obj or datetime.fromisoformat(reservation_data['reservation_date']).date()
-    form.number_of_participants.data = reservation_data['number_of_participants']
-    
-    # バリデーションエラーがある場合（予約確定ボタン以外のPOSTリクエスト時のみ）
-    if request.method == 'POST' and 'confirm' not in request.form and form.errors:
-        for field_name, errors in form.errors.items():
-            try:
-                field = getattr(form, field_name, None)
-                if field and hasattr(field, 'label') and field.label:
-                    field_label = field.label.text
-                else:
-                    field_label = field_name.replace('_', ' ').title()
-                for error in errors:
-                    flash(f'{field_label}: {error}', 'error')
-            except Exception as e:
-                for error in errors:
-                    flash(f'{field_name}: {error}', 'error')
+    # プログラム情報を取得
+    program = db.session.get(ExperienceProgram, reservation_data['program_id'])
+    if not program:
+        flash('体験プログラムが見つかりません。', 'error')
+        session.pop('reservation_data', None)
+        return redirect(url_for('reservation.index'))
     
+    # 確認画面はセッションの予約データをそのまま表示するだけなので、フォームは作成しない
     return render_template('reservations/confirm.html', 
-                         form=form, 
                          program=program,
                          reservation_data=reservation_data,
                          reservation_date_obj=reservation_date_obj)
 
 
 @reservation_bp.route('/show/<int:id>')
+@max_queries(1)
 def show(id):
     """予約の詳細を表示する"""
-    reservation = db.session.get(Reservation, id)
+    # 詳細画面でプログラム名・料金を表示するため、プログラムをJOINで同時に取得する
+    # （それ以外の関連の遅延ロードは意図しないクエリとしてエラーにする）
+    reservation = db.session.get(
+        Reservation, id, options=[db.joinedload(Reservation.program), db.raiseload('*')]
+    )
     if not reservation:
         abort(404)
     
@@ -323,21 +432,25 @@ def show(id):
 
 
 @reservation_bp.route('/list')
+@max_queries(1)
 def list_reservations():
     """予約一覧を表示する（管理用）"""
-    reservations = Reservation.query.order_by(Reservation.reservation_date.desc()).all()
+    # 一覧でプログラム名を表示するため、プログラムをJOINで同時に取得する（N+1クエリの防止）
+    reservations = Reservation.query.options(db.joinedload(Reservation.program)).order_by(
+        Reservation.reservation_date.desc()
+    ).all()
     return render_template('reservations/list.html', reservations=reservations)
 
 
 @reservation_bp.route('/edit/<int:id>', methods=['GET', 'POST'])
 def edit(id):
     """予約を編集する"""
-    reservation = db.session.get(Reservation, id)
-    if not reservation:
-        abort(404)
+    # 編集では予約自身の列のみを使うため、関連の遅延ロードはエラーにする
+    reservation = db.get_or_404(Reservation, id, options=[db.raiseload('*')])
     
-    form = ReservationForm(obj=reservation)
-    form.program_id.choices = [(p.id, p.name) for p in ExperienceProgram.query.all()]
+    # POST時は送信内容でフォームを組み立てるため、予約からの値のコピーはGET時のみ行う
+    form = ReservationForm(obj=reservation) if request.method == 'GET' else ReservationForm()
+    form.program_id.choices = get_program_choices()
     
     if form.validate_on_submit():
         try:
@@ -347,13 +460,9 @@ def edit(id):
                 return render_template('reservations/edit.html', form=form, reservation=reservation)
             
             # 定員チェック（自分自身を除く）
-            existing_reservations = Reservation.query.filter(
-                Reservation.program_id == form.program_id.data,
-                Reservation.reservation_date == form.reservation_date.data,
-                Reservation.id != id
-            ).all()
-            
-            total_participants = sum(r.number_of_participants for r in existing_reservations)
+            total_participants = get_booked_participants(
+                form.program_id.data, form.reservation_date.data, exclude_id=id
+            )
             if total_participants + form.number_of_participants.data > program.capacity:
                 flash(f'この日の予約が満席です。（残り: {program.capacity - total_participants}名）', 'error')
                 return render_template('reservations/edit.html', form=form, reservation=reservation)
@@ -367,6 +476,7 @@ def edit(id):
             reservation.number_of_participants = form.number_of_participants.data
             
             db.session.commit()
+            invalidate_reservation_count_cache()
             
             flash('予約を更新しました。', 'success')
             return redirect(url_for('reservation.show', id=reservation.id))
@@ -379,15 +489,18 @@ def edit(id):
 
 
 @reservation_bp.route('/delete/<int:id>', methods=['POST'])
+@max_queries(1)
 def delete(id):
     """予約を削除する"""
-    reservation = db.session.get(Reservation, id)
-    if not reservation:
+    # 予約を読み込まずにDELETE文1回で削除する（削除件数が0件なら存在しない予約）
+    result = db.session.execute(db.delete(Reservation).where(Reservation.id == id))
+    if result.rowcount == 0:
+        db.session.rollback()
         abort(404)
     
     try:
-        db.session.delete(reservation)
         db.session.commit()
+        invalidate_reservation_count_cache()
         flash('予約を削除しました。', 'success')
     except Exception as e:
         db.session.rollback()
@@ -396,6 +509,22 @@ def delete(id):
     return redirect(url_for('reservation.list_reservations'))
 
 
+def _calendar_display_name(name):
+    """
+    プログラム名をカレンダー表示用に短縮する
+
+    Args:
+        name: プログラム名
+
+    Returns:
+        str: 短縮名を含む場合はその短縮名、含まない場合は元のプログラム名
+    """
+    for short_name in CALENDAR_SHORT_NAMES:
+        if short_name in name:
+            return short_name
+    return name
+
+
 @reservation_bp.route('/api/events')
 def api_events():
     """カレンダー表示用の予約データをJSONで返す"""
@@ -408,22 +537,14 @@ def api_events():
     start_date = date.fromisoformat(start_str.split('T')[0])
     end_date = date.fromisoformat(end_str.split('T')[0])
 
-    programs = ExperienceProgram.query.all()
+    # カレンダー表示に必要な列（ID・名前・定員）のみを取得し、IDで引けるように辞書化する
+    programs = {p.id: p for p in get_programs()}
+    # プログラムごとに変わらない表示名と予約URLはループの前に1回だけ作成する
+    display_names = {pid: _calendar_display_name(p.name) for pid, p in programs.items()}
+    create_urls = {pid: url_for('reservation.create', program_id=pid, _external=False) for pid in programs}
     
-    # 期間内の予約人数を事前に集計
-    reservations_count = db.session.query(
-        Reservation.program_id,
-        Reservation.reservation_date,
-        func.sum(Reservation.number_of_participants).label('total_participants')
-    ).filter(
-        Reservation.reservation_date.between(start_date, end_date)
-    ).group_by(
-        Reservation.program_id,
-        Reservation.reservation_date
-    ).all()
-
-    # 高速アクセスのために辞書に変換
-    reservation_map = {(r.program_id, r.reservation_date): r.total_participants for r in reservations_count}
+    # 期間内のプログラム・日付ごとの予約人数（翌期間分も先読みしてキャッシュされる）
+    reservation_map = get_reservation_counts(start_date, end_date)
 
     events = []
     today = date.today()
@@ -431,7 +552,7 @@ def api_events():
     # 予約があるイベントのみを表示
     for (program_id, reservation_date), booked_participants in reservation_map.items():
         # プログラム情報を取得
-        program = next((p for p in programs if p.id == program_id), None)
+        program = programs.get(program_id)
         if not program:
             continue
             
@@ -439,45 +560,30 @@ def api_events():
         is_full = remaining <= 0
         is_past = reservation_date < today
         
-        # プログラム名をカレンダー表示用に短縮
-        display_name = program.name
-        if 'ハンカチ' in program.name:
-            display_name = 'ハンカチ'
-        elif '天然藍' in program.name:
-            display_name = '天然藍'
-
         # URLを生成（過去の日程、満席の場合は生成しない）
         event_url = None
         if not is_past and not is_full:
-            event_url = url_for('reservation.create', program_id=program.id, _external=False) + f"?date={reservation_date.isoformat()}"
+            event_url = f"{create_urls[program_id]}?date={reservation_date.isoformat()}"
         
-        # 色の決定: 過去=薄グレー、満席=赤、予約ありで余裕あり=緑
+        # 表示スタイルの決定: 過去=薄グレー、満席=赤、予約ありで余裕あり=緑
         if is_past:
-            bg_color = '#d1d5db'  # 薄グレー（過去の日程）
-            border_color = '#d1d5db'
-            cursor_class = 'cursor-not-allowed'
-            title_suffix = '（受付終了）'
+            style, title_suffix = EVENT_STYLE_PAST, '（受付終了）'
         elif is_full:
-            bg_color = '#ef4444'  # 赤（満席）
-            border_color = '#ef4444'
-            cursor_class = 'cursor-not-allowed'
-            title_suffix = '受付終了'
+            style, title_suffix = EVENT_STYLE_FULL, '受付終了'
         else:
-            bg_color = '#22c55e'  # 緑（予約が入っていて余裕がある）
-            border_color = '#22c55e'
-            cursor_class = 'cursor-pointer'
-            title_suffix = f'残り{remaining}名'
+            style, title_suffix = EVENT_STYLE_AVAILABLE, f'残り{remaining}名'
+        bg_color, border_color, class_names = style
         
         event = {
-            'title': f"{display_name}: {title_suffix}",
-            'start': reservation_date.isoformat(),
+            'title': f"{display_names[program_id]}: {title_suffix}",
+            'start': reservation_date,
             'backgroundColor': bg_color,
             'borderColor': border_color,
-            'classNames': [cursor_class],
+            'classNames': class_names,
             'extendedProps': {
                 'program_id': program.id,
                 'program_name': program.name,
-                'date': reservation_date.isoformat()
+                'date': reservation_date
             }
         }
         
@@ -487,4 +593,7 @@ def api_events():
         
         events.append(event)
 
-    return jsonify(events)
+    # 内容のハッシュをETagとして付与し、前回と同じ内容なら304で本文の送信を省略する
+    response = jsonify(events)
+    response.add_etag()
+    return response.make_conditional(request)
@@ -1,12 +1,14 @@
 """
 デコレータユーティリティ
 
-認証・認可に関するデコレータを提供する。
+認証・認可に関するデコレータ、およびテスト用のクエリ数チェックを提供する。
 """
 
 from functools import wraps
-from flask import abort, flash, redirect, url_for
+from flask import abort, current_app, flash, redirect, url_for
 from flask_login import current_user
+from sqlalchemy import event
+from app import db
 
 
 def shinko_center_required(f):
@@ -59,3 +61,43 @@ def user_management_required(f):
         return f(*args, **kwargs)
 
     return decorated_function
+
+
+def max_queries(limit):
+    """
+    ルート処理で発行されるSQLの件数に上限を設けるデコレータ
+
+    TESTING設定が有効な場合のみ発行件数を数え、上限を超えたらAssertionErrorを送出する。
+    N+1クエリなどの性能劣化をテストで検出するために使用する。本番環境では何もしない。
+
+    Args:
+        limit: 許容するクエリ数の上限
+
+    Returns:
+        デコレータ関数
+    """
+
+    def decorator(f):
+        @wraps(f)
+        def decorated_function(*args, **kwargs):
+            if not current_app.config.get("TESTING"):
+                return f(*args, **kwargs)
+
+            query_count = 0
+
+            def count_query(*_):
+                nonlocal query_count
+                query_count += 1
+
+            event.listen(db.engine, "before_cursor_execute", count_query)
+            try:
+                result = f(*args, **kwargs)
+            finally:
+                event.remove(db.engine, "before_cursor_execute", count_query)
+
+            assert query_count <= limit, f"{f.__name__}: クエリ数が上限を超えました（{query_count} > {limit}）"
+            return result
+
+        return decorated_function
+
+    return decorator
@@ -0,0 +1,75 @@
+"""
+一時ファイル削除ユーティリティ
+
+アップロードされた一時ファイルの削除をバックグラウンドスレッドで行う。
+"""
+
+import atexit
+import logging
+import os
+import queue
+import threading
+
+logger = logging.getLogger(__name__)
+
+_cleanup_queue: "queue.Queue[str]" = queue.Queue()
+_worker_lock = threading.Lock()
+_worker = None
+
+
+def _remove(path: str) -> None:
+    """ファイルを削除する（存在しない場合は何もしない）"""
+    try:
+        if os.path.exists(path):
+            os.remove(path)
+            logger.info(f"一時ファイルを削除: {path}")
+    except OSError as e:
+        logger.warning(f"一時ファイルの削除に失敗: {path}, {str(e)}")
+
+
+def _cleanup_worker() -> None:
+    """キューに積まれたファイルを順に削除する"""
+    while True:
+        path = _cleanup_queue.get()
+        try:
+            _remove(path)
+        finally:
+            _cleanup_queue.task_done()
+
+
+@atexit.register
+def _drain_queue() -> None:
+    """
+    プロセス終了時に、まだ削除されていないファイルを削除する
+
+    ワーカーはデーモンスレッドのため、終了時にキューに残ったファイルはここで同期的に削除する。
+    """
+    while True:
+        try:
+            path = _cleanup_queue.get_nowait()
+        except queue.Empty:
+            return
+        _remove(path)
+        _cleanup_queue.task_done()
+
+
+def schedule_removal(path: str) -> None:
+    """
+    ファイルの削除をバックグラウンドスレッドに依頼する
+
+    レスポンスを返す前にファイル削除を待たないようにするため、削除はキューに積んで非同期に行う。
+
+    Args:
+        path: 削除するファイルのパス。空の場合は何もしない
+    """
+    global _worker
+
+    if not path:
+        return
+
+    with _worker_lock:
+        if _worker is None or not _worker.is_alive():
+            _worker = threading.Thread(target=_cleanup_worker, name="file-cleanup", daemon=True)
+            _worker.start()
+
+    _cleanup_queue.put(path)
@@ -0,0 +1,69 @@
+"""
+JSONプロバイダー
+
+Flaskのjsonify/JSONレスポンスのシリアライズにorjsonを使用する。
+"""
+
+import typing as t
+import orjson
+from flask import Response
+from flask.json.provider import DefaultJSONProvider
+
+
+class OrjsonProvider(DefaultJSONProvider):
+    """
+    orjsonでシリアライズするJSONプロバイダー
+
+    date/datetimeはISO 8601形式の文字列として出力される。
+    orjsonが扱えない型（Decimalなど）はFlask標準の変換処理に委ねる。
+    """
+
+    def dumps(self, obj: t.Any, **kwargs: t.Any) -> str:
+        """
+        オブジェクトをJSON文字列に変換する
+
+        Args:
+            obj: 変換するオブジェクト
+            **kwargs: sort_keys, indent のみ解釈し、その他は無視する
+
+        Returns:
+            str: JSON文字列
+        """
+        option = 0
+        if kwargs.get("sort_keys", self.sort_keys):
+            option |= orjson.OPT_SORT_KEYS
+        if kwargs.get("indent"):
+            option |= orjson.OPT_INDENT_2
+        return orjson.dumps(obj, default=self.default, option=option).decode()
+
+    def loads(self, s: str | bytes, **kwargs: t.Any) -> t.Any:
+        """
+        JSON文字列をオブジェクトに変換する
+
+        Args:
+            s: JSON文字列
+            **kwargs: 互換性のために受け取るが使用しない
+
+        Returns:
+            変換されたオブジェクト
+        """
+        return orjson.loads(s)
+
+    def response(self, *args: t.Any, **kwargs: t.Any) -> Response:
+        """
+        引数をJSONにシリアライズしたレスポンスを返す
+
+        文字列へのデコードを挟まず、orjsonのbytes出力をそのままレスポンスにする。
+
+        Returns:
+            Response: application/json のレスポンス
+        """
+        obj = self._prepare_response_obj(args, kwargs)
+        option = orjson.OPT_APPEND_NEWLINE
+        if self.sort_keys:
+            option |= orjson.OPT_SORT_KEYS
+        if (self.compact is None and self._app.debug) or self.compact is False:
+            option |= orjson.OPT_INDENT_2
+        return self._app.response_class(
+            orjson.dumps(obj, default=self.default, option=option), mimetype=self.mimetype
+        )
@@ -4,14 +4,35 @@ PDF処理ユーティリティ関数
 PDFからデータを抽出し、整形するための関数群。
 """
 
+import logging
+import os
 import re
-import sys
 from datetime import datetime
-from typing import Dict, List, Optional
+from typing import BinaryIO, Dict, List, Optional, Union
 import pdfplumber
 import tabula
 import pandas as pd
 
+# 行ごとに呼ばれる変換処理で使用する正規表現（モジュール読み込み時に一度だけコンパイルする）
+WAREKI_DATE_PATTERN = re.compile(r"(令和|平成|昭和)(\d+)年(\d+)月(\d+)日")
+WAREKI_DATETIME_PATTERN = re.compile(r"(令和|平成|昭和)(\d+)年(\d+)月(\d+)日\s*(\d+)時(\d+)分")
+TIME_SUFFIX_PATTERN = re.compile(r"\s+\d+時\d+分.*")
+PRICE_NOISE_PATTERN = re.compile(r"[¥,\s]")
+
+logger = logging.getLogger(__name__)
+
+# テキスト抽出に使用するライブラリ（"pdfplumber" または "pymupdf"）
+# メタデータ抽出の正規表現はpdfplumberの出力に合わせているため、既定はpdfplumberとする。
+# PyMuPDFは高速だが、読み取り順や空白の扱いが異なるため、明示的に指定した場合のみ使用する
+PDF_TEXT_BACKEND = os.environ.get("PDF_TEXT_BACKEND", "pdfplumber").lower()
+
+fitz = None
+if PDF_TEXT_BACKEND == "pymupdf":
+    try:
+        import fitz
+    except ImportError:
+        logger.warning("PyMuPDFがインストールされていないため、pdfplumberを使用します")
+
 
 def convert_wareki_to_seireki(wareki_date: str) -> Optional[str]:
     """
@@ -31,8 +52,7 @@ def convert_wareki_to_seireki(wareki_date: str) -> Optional[str]:
     }
 
     # パターン: 令和7年11月5日
-    pattern = r"(令和|平成|昭和)(\d+)年(\d+)月(\d+)日"
-    match = re.search(pattern, wareki_date)
+    match = WAREKI_DATE_PATTERN.search(wareki_date)
 
     if not match:
         return None
@@ -65,8 +85,7 @@ def convert_wareki_datetime_to_seireki(wareki_datetime: str) -> Optional[str]:
         西暦の日時文字列（YYYY-MM-DD HH:MM:SS形式）、変換できない場合はNone
     """
     # パターン: 令和7年11月6日 17時30分
-    pattern = r"(令和|平成|昭和)(\d+)年(\d+)月(\d+)日\s*(\d+)時(\d+)分"
-    match = re.search(pattern, wareki_datetime)
+    match = WAREKI_DATETIME_PATTERN.search(wareki_datetime)
 
     if match:
         era_name, year_str, month_str, day_str, hour_str, minute_str = match.groups()
@@ -93,7 +112,7 @@ def convert_wareki_datetime_to_seireki(wareki_datetime: str) -> Optional[str]:
             return None
 
     # 時刻がない場合は日付のみを変換
-    date_part = re.sub(r"\s+\d+時\d+分.*", "", wareki_datetime)
+    date_part = TIME_SUFFIX_PATTERN.sub("", wareki_datetime)
     date_str = convert_wareki_to_seireki(date_part)
     if date_str:
         return f"{date_str} 00:00:00"
@@ -115,7 +134,7 @@ def clean_price_string(price_str: str) -> int:
         return 0
 
     # ¥、,、空白を除去
-    cleaned = re.sub(r"[¥,\s]", "", str(price_str))
+    cleaned = PRICE_NOISE_PATTERN.sub("", str(price_str))
 
     try:
         return int(float(cleaned))
@@ -123,12 +142,50 @@ def clean_price_string(price_str: str) -> int:
         return 0
 
 
-def extract_metadata_from_pdf(pdf_path: str) -> Dict[str, Optional[str]]:
+def _rewind(pdf_source: Union[str, BinaryIO]) -> Union[str, BinaryIO]:
+    """ファイルオブジェクトの場合は読み取り位置を先頭に戻す"""
+    if hasattr(pdf_source, "seek"):
+        pdf_source.seek(0)
+    return pdf_source
+
+
+def _extract_text(pdf_source: Union[str, BinaryIO]) -> str:
+    """
+    PDFのすべてのページからテキストを抽出する
+
+    PDF_TEXT_BACKENDに"pymupdf"が指定され、PyMuPDFが利用できる場合はPyMuPDFを、
+    それ以外の場合はpdfplumberを使用する。
+
+    Args:
+        pdf_source: PDFファイルのパス、またはPDFの内容を保持するファイルオブジェクト
+
+    Returns:
+        各ページのテキストを改行で連結した文字列
+    """
+    page_texts = []
+
+    if fitz is not None:
+        if isinstance(pdf_source, str):
+            doc = fitz.open(pdf_source)
+        else:
+            doc = fitz.open(stream=_rewind(pdf_source).read(), filetype="pdf")
+        with doc:
+            for page in doc:
+                page_texts.append(page.get_text())
+    else:
+        with pdfplumber.open(_rewind(pdf_source)) as pdf:
+            for page in pdf.pages:
+                page_texts.append(page.extract_text())
+
+    return "".join(page_text + "\n" for page_text in page_texts if page_text)
+
+
+def extract_metadata_from_pdf(pdf_path: Union[str, BinaryIO]) -> Dict[str, Optional[str]]:
     """
     PDFからメタデータ（レジ番号、営業日、出力日時）を抽出する
 
     Args:
-        pdf_path: PDFファイルのパス
+        pdf_path: PDFファイルのパス、またはPDFの内容を保持するファイルオブジェクト（BytesIO等）
 
     Returns:
         メタデータの辞書（pos_number, sale_date, reported_at）
@@ -140,239 +197,204 @@ def extract_metadata_from_pdf(pdf_path: str) -> Dict[str, Optional[str]]:
     }
 
     try:
-        with pdfplumber.open(pdf_path) as pdf:
-            # すべてのページからテキストを抽出（複数ページに対応）
-            all_text = ""
-            for page in pdf.pages:
-                page_text = page.extract_text()
-                if page_text:
-                    all_text += page_text + "\n"
-
-            if not all_text:
-                print(f"[WARNING] PDFからテキストが抽出できませんでした: {pdf_path}")
-                sys.stdout.flush()
-                return metadata
-
-            # デバッグ: 抽出したテキストの一部を表示（エンコーディングエラーを回避）
-            try:
-                safe_text = all_text[:500].encode("utf-8", errors="replace").decode("utf-8")
-                print(f"[DEBUG] 抽出したテキスト（最初の500文字）: {safe_text}", flush=True)
-            except Exception:
-                print("[DEBUG] 抽出したテキスト（最初の500文字）: [表示できません]", flush=True)
-            sys.stdout.flush()
-
-            # レジ番号の抽出（例: POS1, POS 1, レジ番号：POS1 など）
-            pos_patterns = [
-                r"レジ番号[：:]\s*POS\s*(\d+)",  # レジ番号：POS1 の形式を優先
-                r"POS\s*(\d+)",
-                r"レジ[：:]\s*(\d+)",
-            ]
-            for pattern in pos_patterns:
-                pos_match = re.search(pattern, all_text, re.IGNORECASE)
-                if pos_match:
-                    metadata["pos_number"] = f"POS{pos_match.group(1)}"
-                    print(f"[DEBUG] レジ番号を抽出: {metadata['pos_number']}")
-                    sys.stdout.flush()
-                    break
-
-            # 営業日の抽出（例: 令和7年11月5日）
-            # 複数のパターンを試す（特殊文字に対応）
-            # 「日」と「月」が特殊文字の場合があるため、任意の文字として扱う
-            sale_date_patterns = [
-                r"営業[^\d]*(令和|平成|昭和)(\d+)[^\d]+(\d+)[^\d]+(\d+)",  # 営業日：令和7年11月5日（特殊文字対応）
-                r"営業[^\d]*(\d+)[^\d]+(\d+)[^\d]+(\d+)",  # 営業日の後に数字パターン（特殊文字対応）
-                r"営業日[：:]\s*(令和|平成|昭和)(\d+)年(\d+)月(\d+)日",  # 営業日：令和7年11月5日
-                r"営業日[^\d]*(\d+)年(\d+)月(\d+)日",  # 文字化け対応: 営業日の後に数字パターン
-                r"(令和|平成|昭和)(\d+)年(\d+)月(\d+)日",  # 営業日のラベルがない場合
-            ]
-
-            for pattern in sale_date_patterns:
-                sale_date_match = re.search(pattern, all_text)
-                if sale_date_match:
-                    # グループ数を確認
-                    num_groups = len(sale_date_match.groups())
-                    # 元号が含まれているかチェック（最初のグループが元号の場合）
-                    has_era = num_groups == 4 and sale_date_match.group(1) in ["令和", "平成", "昭和"]
-
-                    if num_groups == 3 and not has_era:
-                        # 数字のみのパターン（令和などの元号がない場合、文字化け）
-                        year, month, day = sale_date_match.groups()
-                        try:
-                            year_int = int(year)
-                            month_int = int(month)
-                            day_int = int(day)
-                            # 令和の開始年は2019年、令和7年 = 2025年
-                            if year_int <= 10:  # 令和の年号と仮定
-                                year_int = 2018 + year_int  # 令和1年 = 2019年
-                            elif year_int <= 32:  # 平成の年号と仮定
-                                year_int = 1988 + year_int  # 平成1年 = 1989年
-                            elif year_int <= 65:  # 昭和の年号と仮定
-                                year_int = 1925 + year_int  # 昭和1年 = 1926年
-
-                            from datetime import datetime
-
-                            datetime(year_int, month_int, day_int)  # 日付の妥当性チェック
-                            metadata["sale_date"] = f"{year_int:04d}-{month_int:02d}-{day_int:02d}"
-                            print(f"[DEBUG] 日付を抽出（数字パターン）: {metadata['sale_date']}")
-                            sys.stdout.flush()
-                            break
-                        except (ValueError, TypeError):
-                            continue
-                    elif has_era:
-                        # 元号付きのパターン（4グループ: 元号, 年, 月, 日）
-                        era, year, month, day = sale_date_match.groups()
-                        sale_date_str = f"{era}{year}年{month}月{day}日"
-                        converted = convert_wareki_to_seireki(sale_date_str)
-                        if converted:
-                            metadata["sale_date"] = converted
-                            print(f"[DEBUG] 日付を抽出（元号パターン）: {metadata['sale_date']}")
-                            sys.stdout.flush()
-                            break
-                    else:
-                        # 元号付きのパターン（3グループ: 元号, 年, 月, 日 - ラベルなし）
-                        sale_date_str = sale_date_match.group(0)
-                        converted = convert_wareki_to_seireki(sale_date_str)
-                        if converted:
-                            metadata["sale_date"] = converted
-                            print(f"[DEBUG] 日付を抽出（元号パターン・ラベルなし）: {metadata['sale_date']}")
-                            sys.stdout.flush()
-                            break
-
-            # 出力日時の抽出（例: 令和7年11月6日 17時30分）
-            # 「日」と「月」が特殊文字の場合があるため、任意の文字として扱う
-            reported_patterns = [
-                # 出力日時：令和7年11月6日 17時30分（特殊文字対応）
-                r"出[^\d]*(令和|平成|昭和)(\d+)[^\d]+(\d+)[^\d]+(\d+)[^\d]*(\d+)時(\d+)分",
-                # 出力日時の後に数字パターン（特殊文字対応）
-                r"出[^\d]*(\d+)[^\d]+(\d+)[^\d]+(\d+)[^\d]*(\d+)時(\d+)分",
-                # 出力日時：令和7年11月6日 17時30分（特殊文字対応）
-                r"出力[^\d]*(令和|平成|昭和)(\d+)[^\d]+(\d+)[^\d]+(\d+)[^\d]*(\d+)時(\d+)分",
-                # 出力日時の後に数字パターン（特殊文字対応）
-                r"出力[^\d]*(\d+)[^\d]+(\d+)[^\d]+(\d+)[^\d]*(\d+)時(\d+)分",
-                # 出力日時：令和7年11月6日 17時30分
-                r"出力日時[：:]\s*(令和|平成|昭和)(\d+)年(\d+)月(\d+)日\s*(\d+)時(\d+)分",
-                # 文字化け対応
-                r"出力日時[^\d]*(\d+)年(\d+)月(\d+)日\s*(\d+)時(\d+)分",
-                r"出力日[：:]\s*(令和|平成|昭和)(\d+)年(\d+)月(\d+)日\s*(\d+)時(\d+)分",
-                r"出力日[^\d]*(\d+)年(\d+)月(\d+)日\s*(\d+)時(\d+)分",
-            ]
-            for pattern in reported_patterns:
-                reported_match = re.search(pattern, all_text)
-                if reported_match:
-                    # グループ数を確認
-                    num_groups = len(reported_match.groups())
-                    # 元号が含まれているかチェック（最初のグループが元号の場合）
-                    has_era = num_groups == 6 and reported_match.group(1) in ["令和", "平成", "昭和"]
-
-                    if num_groups == 5 and not has_era:
-                        # 数字のみのパターン（令和などの元号がない場合、文字化け）
-                        year, month, day, hour, minute = reported_match.groups()
-                        try:
-                            year_int = int(year)
-                            month_int = int(month)
-                            day_int = int(day)
-                            hour_int = int(hour)
-                            minute_int = int(minute)
-                            # 令和の開始年は2019年、令和7年 = 2025年
-                            if year_int <= 10:  # 令和の年号と仮定
-                                year_int = 2018 + year_int
-                            elif year_int <= 32:  # 平成の年号と仮定
-                                year_int = 1988 + year_int
-                            elif year_int <= 65:  # 昭和の年号と仮定
-                                year_int = 1925 + year_int
-
-                            from datetime import datetime
-
-                            datetime(year_int, month_int, day_int, hour_int, minute_int)
-                            reported_at_str = (
-                                f"{year_int:04d}-{month_int:02d}-{day_int:02d} "
-                                f"{hour_int:02d}:{minute_int:02d}:00"
-                            )
-                            metadata["reported_at"] = reported_at_str
-                            print(f"[DEBUG] 出力日時を抽出（数字パターン）: {metadata['reported_at']}")
-                            sys.stdout.flush()
-                            break
-                        except (ValueError, TypeError):
-                            continue
-                    elif has_era:
-                        # 元号付きのパターン（6グループ: 元号, 年, 月, 日, 時, 分）
-                        era, year, month, day, hour, minute = reported_match.groups()
-                        reported_str = f"{era}{year}年{month}月{day}日 {hour}時{minute}分"
-                        converted = convert_wareki_datetime_to_seireki(reported_str)
-                        if converted:
-                            metadata["reported_at"] = converted
-                            print(f"[DEBUG] 出力日時を抽出（元号パターン）: {metadata['reported_at']}")
-                            sys.stdout.flush()
-                            break
-                    else:
-                        # 元号付きのパターン（5グループ: 元号, 年, 月, 日, 時, 分 - ラベルなし）
-                        reported_str = reported_match.group(0)
-                        converted = convert_wareki_datetime_to_seireki(reported_str)
-                        if converted:
-                            metadata["reported_at"] = converted
-                            print(
-                                f"[DEBUG] 出力日時を抽出（元号パターン・ラベルなし）: {metadata['reported_at']}"
-                            )
-                            sys.stdout.flush()
-                            break
-
-            print(f"[DEBUG] 抽出したメタデータ: {metadata}")
-            sys.stdout.flush()
+        # すべてのページからテキストを抽出（複数ページに対応）
+        all_text = _extract_text(pdf_path)
+
+        if not all_text:
+            logger.warning("PDFからテキストが抽出できませんでした: %s", pdf_path)
+            return metadata
+
+        # デバッグ: 抽出したテキストの一部を表示（エンコーディングエラーを回避）
+        if logger.isEnabledFor(logging.DEBUG):
+            safe_text = all_text[:500].encode("utf-8", errors="replace").decode("utf-8")
+            logger.debug("抽出したテキスト（最初の500文字）: %s", safe_text)
+
+        # レジ番号の抽出（例: POS1, POS 1, レジ番号：POS1 など）
+        pos_patterns = [
+            r"レジ番号[：:]\s*POS\s*(\d+)",  # レジ番号：POS1 の形式を優先
+            r"POS\s*(\d+)",
+            r"レジ[：:]\s*(\d+)",
+        ]
+        for pattern in pos_patterns:
+            pos_match = re.search(pattern, all_text, re.IGNORECASE)
+            if pos_match:
+                metadata["pos_number"] = f"POS{pos_match.group(1)}"
+                logger.debug("レジ番号を抽出: %s", metadata["pos_number"])
+                break
+
+        # 営業日の抽出（例: 令和7年11月5日）
+        # 複数のパターンを試す（特殊文字に対応）
+        # 「日」と「月」が特殊文字の場合があるため、任意の文字として扱う
+        sale_date_patterns = [
+            r"営業[^\d]*(令和|平成|昭和)(\d+)[^\d]+(\d+)[^\d]+(\d+)",  # 営業日：令和7年11月5日（特殊文字対応）
+            r"営業[^\d]*(\d+)[^\d]+(\d+)[^\d]+(\d+)",  # 営業日の後に数字パターン（特殊文字対応）
+            r"営業日[：:]\s*(令和|平成|昭和)(\d+)年(\d+)月(\d+)日",  # 営業日：令和7年11月5日
+            r"営業日[^\d]*(\d+)年(\d+)月(\d+)日",  # 文字化け対応: 営業日の後に数字パターン
+            r"(令和|平成|昭和)(\d+)年(\d+)月(\d+)日",  # 営業日のラベルがない場合
+        ]
+
+        for pattern in sale_date_patterns:
+            sale_date_match = re.search(pattern, all_text)
+            if sale_date_match:
+                # グループ数を確認
+                num_groups = len(sale_date_match.groups())
+                # 元号が含まれているかチェック（最初のグループが元号の場合）
+                has_era = num_groups == 4 and sale_date_match.group(1) in ["令和", "平成", "昭和"]
+
+                if num_groups == 3 and not has_era:
+                    # 数字のみのパターン（令和などの元号がない場合、文字化け）
+                    year, month, day = sale_date_match.groups()
+                    try:
+                        year_int = int(year)
+                        month_int = int(month)
+                        day_int = int(day)
+                        # 令和の開始年は2019年、令和7年 = 2025年
+                        if year_int <= 10:  # 令和の年号と仮定
+                            year_int = 2018 + year_int  # 令和1年 = 2019年
+                        elif year_int <= 32:  # 平成の年号と仮定
+                            year_int = 1988 + year_int  # 平成1年 = 1989年
+                        elif year_int <= 65:  # 昭和の年号と仮定
+                            year_int = 1925 + year_int  # 昭和1年 = 1926年
+
+                        datetime(year_int, month_int, day_int)  # 日付の妥当性チェック
+                        metadata["sale_date"] = f"{year_int:04d}-{month_int:02d}-{day_int:02d}"
+                        logger.debug("日付を抽出（数字パターン）: %s", metadata["sale_date"])
+                        break
+                    except (ValueError, TypeError):
+                        continue
+                elif has_era:
+                    # 元号付きのパターン（4グループ: 元号, 年, 月, 日）
+                    era, year, month, day = sale_date_match.groups()
+                    sale_date_str = f"{era}{year}年{month}月{day}日"
+                    converted = convert_wareki_to_seireki(sale_date_str)
+                    if converted:
+                        metadata["sale_date"] = converted
+                        logger.debug("日付を抽出（元号パターン）: %s", metadata["sale_date"])
+                        break
+                else:
+                    # 元号付きのパターン（3グループ: 元号, 年, 月, 日 - ラベルなし）
+                    sale_date_str = sale_date_match.group(0)
+                    converted = convert_wareki_to_seireki(sale_date_str)
+                    if converted:
+                        metadata["sale_date"] = converted
+                        logger.debug("日付を抽出（元号パターン・ラベルなし）: %s", metadata["sale_date"])
+                        break
+
+        # 出力日時の抽出（例: 令和7年11月6日 17時30分）
+        # 「日」と「月」が特殊文字の場合があるため、任意の文字として扱う
+        reported_patterns = [
+            # 出力日時：令和7年11月6日 17時30分（特殊文字対応）
+            r"出[^\d]*(令和|平成|昭和)(\d+)[^\d]+(\d+)[^\d]+(\d+)[^\d]*(\d+)時(\d+)分",
+            # 出力日時の後に数字パターン（特殊文字対応）
+            r"出[^\d]*(\d+)[^\d]+(\d+)[^\d]+(\d+)[^\d]*(\d+)時(\d+)分",
+            # 出力日時：令和7年11月6日 17時30分（特殊文字対応）
+            r"出力[^\d]*(令和|平成|昭和)(\d+)[^\d]+(\d+)[^\d]+(\d+)[^\d]*(\d+)時(\d+)分",
+            # 出力日時の後に数字パターン（特殊文字対応）
+            r"出力[^\d]*(\d+)[^\d]+(\d+)[^\d]+(\d+)[^\d]*(\d+)時(\d+)分",
+            # 出力日時：令和7年11月6日 17時30分
+            r"出力日時[：:]\s*(令和|平成|昭和)(\d+)年(\d+)月(\d+)日\s*(\d+)時(\d+)分",
+            # 文字化け対応
+            r"出力日時[^\d]*(\d+)年(\d+)月(\d+)日\s*(\d+)時(\d+)分",
+            r"出力日[：:]\s*(令和|平成|昭和)(\d+)年(\d+)月(\d+)日\s*(\d+)時(\d+)分",
+            r"出力日[^\d]*(\d+)年(\d+)月(\d+)日\s*(\d+)時(\d+)分",
+        ]
+        for pattern in reported_patterns:
+            reported_match = re.search(pattern, all_text)
+            if reported_match:
+                # グループ数を確認
+                num_groups = len(reported_match.groups())
+                # 元号が含まれているかチェック（最初のグループが元号の場合）
+                has_era = num_groups == 6 and reported_match.group(1) in ["令和", "平成", "昭和"]
+
+                if num_groups == 5 and not has_era:
+                    # 数字のみのパターン（令和などの元号がない場合、文字化け）
+                    year, month, day, hour, minute = reported_match.groups()
+                    try:
+                        year_int = int(year)
+                        month_int = int(month)
+                        day_int = int(day)
+                        hour_int = int(hour)
+                        minute_int = int(minute)
+                        # 令和の開始年は2019年、令和7年 = 2025年
+                        if year_int <= 10:  # 令和の年号と仮定
+                            year_int = 2018 + year_int
+                        elif year_int <= 32:  # 平成の年号と仮定
+                            year_int = 1988 + year_int
+                        elif year_int <= 65:  # 昭和の年号と仮定
+                            year_int = 1925 + year_int
+
+                        datetime(year_int, month_int, day_int, hour_int, minute_int)
+                        reported_at_str = (
+                            f"{year_int:04d}-{month_int:02d}-{day_int:02d} "
+                            f"{hour_int:02d}:{minute_int:02d}:00"
+                        )
+                        metadata["reported_at"] = reported_at_str
+                        logger.debug("出力日時を抽出（数字パターン）: %s", metadata["reported_at"])
+                        break
+                    except (ValueError, TypeError):
+                        continue
+                elif has_era:
+                    # 元号付きのパターン（6グループ: 元号, 年, 月, 日, 時, 分）
+                    era, year, month, day, hour, minute = reported_match.groups()
+                    reported_str = f"{era}{year}年{month}月{day}日 {hour}時{minute}分"
+                    converted = convert_wareki_datetime_to_seireki(reported_str)
+                    if converted:
+                        metadata["reported_at"] = converted
+                        logger.debug("出力日時を抽出（元号パターン）: %s", metadata["reported_at"])
+                        break
+                else:
+                    # 元号付きのパターン（5グループ: 元号, 年, 月, 日, 時, 分 - ラベルなし）
+                    reported_str = reported_match.group(0)
+                    converted = convert_wareki_datetime_to_seireki(reported_str)
+                    if converted:
+                        metadata["reported_at"] = converted
+                        logger.debug("出力日時を抽出（元号パターン・ラベルなし）: %s", metadata["reported_at"])
+                        break
+
+        logger.debug("抽出したメタデータ: %s", metadata)
 
     except Exception as e:
-        import traceback
-
-        print(f"[ERROR] PDFメタデータ抽出エラー: {e}")
-        print(f"[ERROR] トレースバック:\n{traceback.format_exc()}")
-        sys.stdout.flush()
+        logger.exception("PDFメタデータ抽出エラー: %s", e)
 
     return metadata
 
 
-def extract_table_data_from_pdf(pdf_path: str) -> List[Dict[str, any]]:
+def extract_table_data_from_pdf(pdf_path: Union[str, BinaryIO]) -> List[Dict[str, any]]:
     """
     PDFからテーブルデータを抽出する
 
     Args:
-        pdf_path: PDFファイルのパス
+        pdf_path: PDFファイルのパス、またはPDFの内容を保持するファイルオブジェクト（BytesIO等）
 
     Returns:
         抽出したテーブルデータのリスト
     """
     try:
-        print(f"[DEBUG] テーブルデータ抽出開始: {pdf_path}", flush=True)
-        import sys
-
-        sys.stdout.flush()
+        logger.debug("テーブルデータ抽出開始: %s", pdf_path)
 
         # まずtabula-pyを試す（Javaが必要）
         dfs = []
         try:
-            print("[DEBUG] tabula-pyでストリームモードで抽出を試みます...", flush=True)
-            sys.stdout.flush()
+            logger.debug("tabula-pyでストリームモードで抽出を試みます...")
             dfs = tabula.read_pdf(
-                pdf_path,
+                _rewind(pdf_path),
                 pages="all",
                 multiple_tables=True,
                 pandas_options={"header": None},
                 lattice=False,
                 stream=True,
             )
-            print(f"[DEBUG] ストリームモードで抽出: {len(dfs) if dfs else 0}個のテーブル", flush=True)
-            sys.stdout.flush()
+            logger.debug("ストリームモードで抽出: %d個のテーブル", len(dfs) if dfs else 0)
         except Exception as e:
-            print(f"[DEBUG] tabula-pyでエラー（Javaが必要な可能性）: {e}", flush=True)
-            sys.stdout.flush()
+            logger.debug("tabula-pyでエラー（Javaが必要な可能性）: %s", e)
             # tabula-pyが失敗した場合、pdfplumberを使用
-            print("[DEBUG] pdfplumberでテーブル抽出を試みます...", flush=True)
-            sys.stdout.flush()
+            logger.debug("pdfplumberでテーブル抽出を試みます...")
 
-            with pdfplumber.open(pdf_path) as pdf:
+            with pdfplumber.open(_rewind(pdf_path)) as pdf:
                 for page_num, page in enumerate(pdf.pages):
                     tables = page.extract_tables()
                     if tables:
-                        print(f"[DEBUG] ページ{page_num+1}で{len(tables)}個のテーブルを発見", flush=True)
-                        sys.stdout.flush()
+                        logger.debug("ページ%dで%d個のテーブルを発見", page_num + 1, len(tables))
                         for table in tables:
                             # テーブルをDataFrameに変換
                             if table:
@@ -380,51 +402,40 @@ def extract_table_data_from_pdf(pdf_path: str) -> List[Dict[str, any]]:
                                 dfs.append(df)
 
         if not dfs:
-            print("[DEBUG] テーブルデータが抽出できませんでした", flush=True)
-            sys.stdout.flush()
+            logger.debug("テーブルデータが抽出できませんでした")
             return []
 
         # すべてのテーブルを結合
         all_data = []
         for i, df in enumerate(dfs):
-            print(f"[DEBUG] テーブル{i+1}: {len(df)}行 x {len(df.columns)}列", flush=True)
-            sys.stdout.flush()
+            logger.debug("テーブル%d: %d行 x %d列", i + 1, len(df), len(df.columns))
 
             # 空のDataFrameをスキップ
             if df.empty:
-                print(f"[DEBUG] テーブル{i+1}は空です", flush=True)
-                sys.stdout.flush()
+                logger.debug("テーブル%dは空です", i + 1)
                 continue
 
             # 最初の3行を表示（デバッグ用）
-            if len(df) > 0:
-                print(f"[DEBUG] テーブル{i+1}の最初の3行:", flush=True)
+            if logger.isEnabledFor(logging.DEBUG):
+                logger.debug("テーブル%dの最初の3行:", i + 1)
                 for j in range(min(3, len(df))):
-                    row_data = df.iloc[j].tolist()
-                    print(f"  行{j+1}: {row_data}", flush=True)
-                sys.stdout.flush()
+                    logger.debug("  行%d: %s", j + 1, df.iloc[j].tolist())
 
             # データを辞書のリストに変換
-            for _, row in df.iterrows():
-                # 行が空でない場合のみ処理
-                if not row.isna().all():
-                    row_dict = {}
-                    for col_idx, value in enumerate(row):
-                        if pd.notna(value):
-                            row_dict[f"col_{col_idx}"] = str(value).strip()
-                    if row_dict:
-                        all_data.append(row_dict)
-
-        print(f"[DEBUG] 抽出したテーブルデータ: {len(all_data)}行", flush=True)
-        sys.stdout.flush()
+            # （iterrowsのように行ごとにSeriesを作らないよう、タプルで1行ずつ取り出す）
+            for row in df.itertuples(index=False, name=None):
+                row_dict = {
+                    f"col_{col_idx}": str(value).strip() for col_idx, value in enumerate(row) if pd.notna(value)
+                }
+                # 空行（すべて欠損値の行）は追加しない
+                if row_dict:
+                    all_data.append(row_dict)
+
+        logger.debug("抽出したテーブルデータ: %d行", len(all_data))
         return all_data
 
     except Exception as e:
-        import traceback
-
-        print(f"[ERROR] テーブルデータ抽出エラー: {e}", flush=True)
-        print(f"[ERROR] トレースバック:\n{traceback.format_exc()}", flush=True)
-        sys.stdout.flush()
+        logger.exception("テーブルデータ抽出エラー: %s", e)
         return []
 
 
@@ -444,22 +455,20 @@ def parse_sales_data(
     sales_records = []
 
     if not table_data:
-        print("[WARNING] テーブルデータが空です", flush=True)
-        sys.stdout.flush()
+        logger.warning("テーブルデータが空です")
         return sales_records
 
     # デバッグ: 最初の数行のテーブルデータを表示
-    print("[DEBUG] テーブルデータのサンプル（最初の3行）:", flush=True)
-    for i, row in enumerate(table_data[:3]):
-        print(f"  行{i+1}: {row}", flush=True)
-    sys.stdout.flush()
+    if logger.isEnabledFor(logging.DEBUG):
+        logger.debug("テーブルデータのサンプル（最初の3行）:")
+        for i, row in enumerate(table_data[:3]):
+            logger.debug("  行%d: %s", i + 1, row)
 
     for row_idx, row in enumerate(table_data):
         # ヘッダー行をスキップ（商品コード、商品名などの文字列が含まれている行）
         col_0 = row.get("col_0", "").strip() if "col_0" in row else ""
         if col_0 in ["商品コード", "商品名", "単価", "数量", "小計"] or not col_0:
-            print(f"[DEBUG] 行{row_idx+1}をスキップ: ヘッダー行または空行", flush=True)
-            sys.stdout.flush()
+            logger.debug("行%dをスキップ: ヘッダー行または空行", row_idx + 1)
             continue
 
         # 列の数を確認
@@ -523,11 +532,7 @@ def parse_sales_data(
             sales_records.append(left_record)
             product_name = left_record["product_name"]
             quantity = left_record["quantity"]
-            print(
-                f"[DEBUG] 行{row_idx+1}（左列）をレコードに追加: " f"{product_name} x{quantity}",
-                flush=True,
-            )
-            sys.stdout.flush()
+            logger.debug("行%d（左列）をレコードに追加: %s x%s", row_idx + 1, product_name, quantity)
 
         # 右列からレコードを作成（2列組の場合）
         if num_cols >= 10:
@@ -536,12 +541,9 @@ def parse_sales_data(
                 sales_records.append(right_record)
                 right_product_name = right_record["product_name"]
                 right_quantity = right_record["quantity"]
-                print(
-                    f"[DEBUG] 行{row_idx+1}（右列）をレコードに追加: "
-                    f"{right_product_name} x{right_quantity}",
-                    flush=True,
+                logger.debug(
+                    "行%d（右列）をレコードに追加: %s x%s", row_idx + 1, right_product_name, right_quantity
                 )
-                sys.stdout.flush()
 
     # 総合計金額を計算（同じPOSレジの全レコードで同じ値）
     if sales_records:
@@ -549,7 +551,6 @@ def parse_sales_data(
         total = sum(record["subtotal"] for record in sales_records)
         for record in sales_records:
             record["total_amount"] = total
-        print(f"[DEBUG] 総合計金額: {total:,}円", flush=True)
-        sys.stdout.flush()
+        logger.debug("総合計金額: %s円", f"{total:,}")
 
     return sales_records
@@ -227,8 +227,8 @@ class ZenginConverter:
         # 文字列に変換
         str_value = str(value).strip()
 
-        # 数値チェック
-        if not str_value.isdigit():
+        # 数値チェック（全角数字などASCII以外の数字は固定長レコードを崩すため不可）
+        if not (str_value.isascii() and str_value.isdigit()):
             raise ZenginFormatError(f"{field_name}は数値である必要があります: {value}")
 
         # 桁数チェック
@@ -248,7 +248,24 @@ class ZenginConverter:
         Returns:
             (検証結果, エラーメッセージリスト)
         """
+        errors, _ = cls._check_customer_data(row)
+        return len(errors) == 0, errors
+
+    @classmethod
+    def _check_customer_data(cls, row: Dict) -> Tuple[List[str], Dict]:
+        """
+        顧客データを検証し、レコード作成に使用する検証済みの値を返す
+
+        convert_row_to_recordでも使用し、1行につき各項目の検証・変換を1回で済ませる。
+
+        Args:
+            row: 顧客データの辞書
+
+        Returns:
+            (エラーメッセージリスト, 検証済みの値の辞書)
+        """
         errors = []
+        values = {}
 
         # 必須フィールドのチェック
         required_fields = ["bank_code", "branch_code", "account_number", "recipient_name", "amount"]
@@ -259,27 +276,21 @@ class ZenginConverter:
         # 銀行コードの検証
         if "bank_code" in row and not pd.isna(row["bank_code"]):
             try:
-                bank_code = cls._validate_numeric(row["bank_code"], "銀行コード", 4)
-                if len(bank_code) > 4:
-                    errors.append("銀行コードは4桁以内である必要があります")
+                values["bank_code"] = cls._validate_numeric(row["bank_code"], "銀行コード", 4)
             except ZenginFormatError as e:
                 errors.append(str(e))
 
         # 支店コードの検証
         if "branch_code" in row and not pd.isna(row["branch_code"]):
             try:
-                branch_code = cls._validate_numeric(row["branch_code"], "支店コード", 3)
-                if len(branch_code) > 3:
-                    errors.append("支店コードは3桁以内である必要があります")
+                values["branch_code"] = cls._validate_numeric(row["branch_code"], "支店コード", 3)
             except ZenginFormatError as e:
                 errors.append(str(e))
 
         # 口座番号の検証
         if "account_number" in row and not pd.isna(row["account_number"]):
             try:
-                account_number = cls._validate_numeric(row["account_number"], "口座番号", 7)
-                if len(account_number) > 7:
-                    errors.append("口座番号は7桁以内である必要があります")
+                values["account_number"] = cls._validate_numeric(row["account_number"], "口座番号", 7)
             except ZenginFormatError as e:
                 errors.append(str(e))
 
@@ -302,6 +313,7 @@ class ZenginConverter:
 
                 if amount_value <= 0:
                     errors.append("振込金額は0より大きい必要があります")
+                values["amount"] = amount_value
             except (ValueError, TypeError):
                 errors.append(f"振込金額の形式が不正です: {row['amount']}")
 
@@ -316,8 +328,9 @@ class ZenginConverter:
                 recipient_name_bytes = recipient_name_hankaku.encode("shift_jis", errors="replace")
                 if len(recipient_name_bytes) > 30:
                     errors.append(f"受取人名が長すぎます（最大30バイト）: {recipient_name}")
+                values["recipient_name"] = recipient_name_hankaku
 
-        return len(errors) == 0, errors
+        return errors, values
 
     @classmethod
     def convert_row_to_record(cls, row: Dict, requester_code: str = "", requester_name: str = "") -> str:
@@ -335,9 +348,9 @@ class ZenginConverter:
         Raises:
             ZenginFormatError: 変換エラー時
         """
-        # バリデーション
-        is_valid, errors = cls.validate_customer_data(row)
-        if not is_valid:
+        # バリデーション（銀行コード・口座番号などは検証済みの値をそのまま使用する）
+        errors, values = cls._check_customer_data(row)
+        if errors:
             raise ZenginFormatError(f"データ検証エラー: {', '.join(errors)}")
 
         # レコードをバイト配列として初期化（120バイト、スペースで埋める）
@@ -350,8 +363,7 @@ class ZenginConverter:
         record_bytes[defs["data_type"]["pos"]] = ord(defs["data_type"]["default"])
 
         # 2. 被仕向銀行番号（4桁、右寄せゼロ埋め）
-        bank_code = cls._validate_numeric(row["bank_code"], "銀行コード", 4)
-        bank_code_str = cls._pad_string(bank_code, 4, "0", "right")
+        bank_code_str = cls._pad_string(values["bank_code"], 4, "0", "right")
         bank_code_bytes = bank_code_str.encode("shift_jis")
         pos = defs["bank_code"]["pos"]
         record_bytes[pos : pos + len(bank_code_bytes)] = bank_code_bytes
@@ -365,8 +377,7 @@ class ZenginConverter:
         record_bytes[pos : pos + 15] = bank_name_bytes[:15]
 
         # 4. 被仕向支店番号（3桁、右寄せゼロ埋め）
-        branch_code = cls._validate_numeric(row["branch_code"], "支店コード", 3)
-        branch_code_str = cls._pad_string(branch_code, 3, "0", "right")
+        branch_code_str = cls._pad_string(values["branch_code"], 3, "0", "right")
         branch_code_bytes = branch_code_str.encode("shift_jis")
         pos = defs["branch_code"]["pos"]
         record_bytes[pos : pos + len(branch_code_bytes)] = branch_code_bytes
@@ -399,28 +410,19 @@ class ZenginConverter:
         record_bytes[defs["account_type"]["pos"]] = ord(account_type)
 
         # 8. 口座番号（7桁、右寄せゼロ埋め）
-        account_number = cls._validate_numeric(row["account_number"], "口座番号", 7)
-        account_number_str = cls._pad_string(account_number, 7, "0", "right")
+        account_number_str = cls._pad_string(values["account_number"], 7, "0", "right")
         account_number_bytes = account_number_str.encode("shift_jis")
         pos = defs["account_number"]["pos"]
         record_bytes[pos : pos + len(account_number_bytes)] = account_number_bytes
 
         # 9. 受取人名（30バイト、左寄せスペース埋め、半角カナ）
-        recipient_name = str(row["recipient_name"]).strip()
-        recipient_name_hankaku = cls._to_hankaku_kana(recipient_name)  # 半角カナに変換
-        recipient_name_str = cls._pad_string(recipient_name_hankaku, 30, " ", "left")
+        recipient_name_str = cls._pad_string(values["recipient_name"], 30, " ", "left")
         recipient_name_bytes = recipient_name_str.encode("shift_jis")
         pos = defs["recipient_name"]["pos"]
         record_bytes[pos : pos + 30] = recipient_name_bytes[:30]
 
         # 10. 振込金額（10桁、右寄せゼロ埋め）
-        if isinstance(row["amount"], (int, float)):
-            amount_value = int(row["amount"])
-        else:
-            amount_str_raw = str(row["amount"]).replace(",", "").strip()
-            amount_value = int(float(amount_str_raw))
-
-        amount_str = cls._pad_string(str(amount_value), 10, "0", "right")
+        amount_str = cls._pad_string(str(values["amount"]), 10, "0", "right")
         amount_bytes = amount_str.encode("shift_jis")
         record_bytes[defs["amount"]["pos"] : defs["amount"]["pos"] + len(amount_bytes)] = amount_bytes
 
@@ -693,14 +695,13 @@ class ZenginConverter:
             logger = logging.getLogger(__name__)
             logger.info(f"データ変換開始: 合計{total_rows}行を処理します")
 
-            # 各行を処理
-            for idx, row in df.iterrows():
+            # 各行を処理（行ごとにSeriesを作らないよう、DataFrameを一括で辞書のリストに変換する）
+            for idx, row_dict in zip(df.index, df.to_dict("records")):
                 try:
                     # 進捗ログ（10行ごと、または最初の数行）
                     if idx < 5 or idx % 10 == 0:
                         logger.info(f"処理中: {idx + 1}/{total_rows}行目")
 
-                    row_dict = row.to_dict()
                     record = cls.convert_row_to_record(row_dict, requester_code, requester_name)
                     records.append(record)
 
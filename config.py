@@ -2,6 +2,7 @@
 アプリケーション設定モジュール
 """
 
+import logging
 import os
 from pathlib import Path
 
@@ -15,6 +16,10 @@ class Config:
     SECRET_KEY = os.environ.get("SECRET_KEY") or "dev-secret-key-change-in-production"
     SQLALCHEMY_TRACK_MODIFICATIONS = False
     SQLALCHEMY_DATABASE_URI = os.environ.get("DATABASE_URL") or f'sqlite:///{basedir / "instance" / "app.db"}'
+    # アップロードされたPOSレポートPDFをディスクにも保存するか（デバッグ用、通常はメモリ上で処理）
+    POS_KEEP_UPLOADS = os.environ.get("POS_KEEP_UPLOADS", "False").lower() == "true"
+    # POSレポートPDFの取込をバックグラウンドで実行するか（有効な場合は202と進捗確認ページを返す）
+    POS_ASYNC_UPLOAD = os.environ.get("POS_ASYNC_UPLOAD", "False").lower() == "true"
 
     @staticmethod
     def init_app(app):
@@ -33,5 +38,10 @@ class ProductionConfig(Config):
 
     DEBUG = False
 
+    @staticmethod
+    def init_app(app):
+        """本番環境ではINFO以上のログのみを出力する"""
+        app.logger.setLevel(logging.INFO)
+
 
 config = {"development": DevelopmentConfig, "production": ProductionConfig, "default": DevelopmentConfig}
@@ -466,10 +466,10 @@ def create_settlements_for_month(
     sheets_created_count = 0
 
     # --- 顧客ごとに精算書シートを作成 ---
-    # customers_df.iterrows(): 顧客データの各行を順番に処理
-    # _: 行番号（今回は使わないので、_で無視）
-    # customer: その行の顧客データ（pandasのSeriesオブジェクト）
-    for _, customer in customers_df.iterrows():
+    # customers_df.to_dict("records"): 顧客データを行ごとの辞書のリストに一括変換して順番に処理
+    # （iterrowsのように行ごとにSeriesオブジェクトを作らないため高速）
+    # customer: その行の顧客データ（列名をキーとする辞書）
+    for customer in customers_df.to_dict("records"):
         # 顧客IDと会社名を取得
         client_id = customer["クライアントID"]
         client_name = customer["会社名"]
@@ -485,8 +485,8 @@ def create_settlements_for_month(
 
         print(f"- {client_name}: 精算書シートを作成中...")
 
-        # 顧客データを辞書形式に変換（関数に渡すために）
-        customer_data_dict = customer.to_dict()
+        # 顧客データ（関数に渡すために辞書形式で保持している）
+        customer_data_dict = customer
         # 売上データを辞書のリスト形式に変換（関数に渡すために）
         sales_data_list = client_sales_df.to_dict("records")
 
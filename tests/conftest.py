@@ -10,6 +10,7 @@ import tempfile
 from app import create_app, db
 from app.models import ExperienceProgram, Reservation
 from app.models.pos_sales import PosSales
+from app.reservation import invalidate_program_cache, invalidate_reservation_count_cache
 
 
 @pytest.fixture
@@ -30,6 +31,9 @@ def app():
 
     with app.app_context():
         db.create_all()
+        # テストごとにDBが作り直されるため、前のテストのキャッシュを破棄する
+        invalidate_program_cache()
+        invalidate_reservation_count_cache()
         yield app
         db.session.remove()
         db.drop_all()
@@ -5,10 +5,10 @@ pytestを使用してモデルの動作をテストします。
 カバレッジ70%を意識したテスト実装
 """
 import pytest
-from datetime import date
+from datetime import date, datetime
 from sqlalchemy.exc import IntegrityError
 from app import db
-from app.models import ExperienceProgram, Reservation
+from app.models import ExperienceProgram, Reservation, User
 
 
 class TestExperienceProgram:
@@ -246,3 +246,20 @@ class TestModelIntegration:
             assert reservation.reservation_date.month == 12
             assert reservation.reservation_date.day == 31
 
+
+class TestServerDefaults:
+    """DB側で設定される日時カラムのテストクラス"""
+
+    def test_user_created_at_set_by_database(self, app):
+        """flush後にcreated_atがDBのCURRENT_TIMESTAMPで設定されることのテスト"""
+        with app.app_context():
+            user = User(
+                username='日時テスト',
+                email='timestamp@example.com',
+                department='振興センター',
+                hashed_password='x'
+            )
+            db.session.add(user)
+            db.session.flush()
+
+            assert isinstance(user.created_at, datetime)
@@ -6,11 +6,26 @@ POS機能のユニットテストと統合テストを含む。
 
 import os
 import tempfile
+from io import BytesIO
 from pathlib import Path
 import pytest
 from app import db
+from app.models.daily_product_sales import DailyProductSales
+from app.models.daily_sales import DailySales
+from app.models.pdf_upload import PdfUpload
 from app.models.pos_sales import PosSales
-from app.features.pos import allowed_file, save_pdf_data_to_db
+from app.models.pos_upload_job import PosUploadJob
+from app.features.pos import (
+    _run_upload_job,
+    aggregate_daily_sales,
+    allowed_file,
+    compute_pdf_hash,
+    format_jp_date,
+    ingest_pdf_uploads,
+    is_pdf_stream,
+    parse_pdf_uploads_in_pool,
+    save_pdf_data_to_db,
+)
 
 
 class TestPosFeatures:
@@ -29,6 +44,35 @@ class TestPosFeatures:
         assert allowed_file("test") is False
         assert allowed_file("") is False
 
+    def test_is_pdf_stream(self):
+        """PDFヘッダーの確認後、読み取り位置が先頭に戻ることを確認"""
+        pdf_stream = BytesIO(b"%PDF-1.4 test")
+        assert is_pdf_stream(pdf_stream) is True
+        assert pdf_stream.tell() == 0
+        assert is_pdf_stream(BytesIO(b"not a pdf")) is False
+
+    def test_format_jp_date(self):
+        """日付が「YYYY年MM月DD日」形式に変換されることを確認"""
+        assert format_jp_date("2025-11-05") == "2025年11月05日"
+        assert format_jp_date("不正な日付") == "不正な日付"
+
+    def test_compute_pdf_hash_bytes_and_path(self, tmp_path):
+        """ファイル内容とファイルパスで同じハッシュ値になることを確認"""
+        pdf_bytes = b"%PDF-1.4 test"
+        pdf_path = tmp_path / "test.pdf"
+        pdf_path.write_bytes(pdf_bytes)
+
+        assert compute_pdf_hash(pdf_bytes) == compute_pdf_hash(str(pdf_path))
+        assert compute_pdf_hash(pdf_bytes) != compute_pdf_hash(b"%PDF-1.4 other")
+
+    def test_compute_pdf_hash_stream(self):
+        """ストリームのハッシュ値が内容と一致し、読み取り位置が先頭に戻ることを確認"""
+        pdf_bytes = b"%PDF-1.4 test"
+        stream = BytesIO(pdf_bytes)
+
+        assert compute_pdf_hash(stream) == compute_pdf_hash(pdf_bytes)
+        assert stream.read() == pdf_bytes
+
     def test_save_pdf_data_to_db_new_record(self, app, sample_pos_data):
         """新規レコードの保存をテスト"""
         with app.app_context():
@@ -118,6 +162,82 @@ class TestPosFeatures:
             assert stats["skipped"] == 0
             assert stats["overwritten"] == 0
 
+    def test_aggregate_daily_sales_after_last_pos_deleted(self, app, sample_pos_data):
+        """営業日の最後のPOSレジを削除すると、その日の集計データも削除されることをテスト"""
+        with app.app_context():
+            save_pdf_data_to_db([sample_pos_data], "test.pdf", overwrite=False)
+            aggregate_daily_sales("2025-11-05")
+            assert DailySales.query.filter_by(sale_date="2025-11-05").count() == 1
+            assert DailyProductSales.query.filter_by(sale_date="2025-11-05").count() == 1
+
+            PosSales.query.filter_by(sale_date="2025-11-05", pos_number="POS1").delete()
+            aggregate_daily_sales("2025-11-05")
+
+            assert DailySales.query.filter_by(sale_date="2025-11-05").count() == 0
+            assert DailyProductSales.query.filter_by(sale_date="2025-11-05").count() == 0
+
+    def test_ingest_pdf_uploads_skipped_pdf_not_recorded(self, app, sample_pos_data, monkeypatch):
+        """すべて重複としてスキップされたPDFの取込履歴が記録されないことをテスト"""
+        monkeypatch.setattr(
+            "app.features.pos.parse_pdf_upload",
+            lambda filename, pdf_data: {"filename": filename, "sales_records": [sample_pos_data], "error": None},
+        )
+        with app.app_context():
+            save_pdf_data_to_db([sample_pos_data], "test.pdf", overwrite=False)
+
+            summary = ingest_pdf_uploads([("hash1", "test.pdf", b"")])
+
+            assert summary["stats"]["skipped"] == 1
+            assert db.session.get(PdfUpload, "hash1") is None
+
+    def test_ingest_pdf_uploads_overwrite_recorded_pdf(self, app, sample_pos_data, monkeypatch):
+        """取込履歴があるPDFを上書き取込してもエラーにならないことをテスト"""
+        new_data = sample_pos_data.copy()
+        new_data["reported_at"] = "2025-11-06 18:00:00"
+        monkeypatch.setattr(
+            "app.features.pos.parse_pdf_upload",
+            lambda filename, pdf_data: {"filename": filename, "sales_records": [new_data], "error": None},
+        )
+        with app.app_context():
+            save_pdf_data_to_db([sample_pos_data], "test.pdf", overwrite=False)
+            db.session.add(PdfUpload(sha256="hash1", filename="test.pdf", pos_number="POS1", sale_date="2025-11-05"))
+            db.session.commit()
+
+            summary = ingest_pdf_uploads([("hash1", "test.pdf", b"")], overwrite=True)
+
+            assert summary["error"] is None
+            assert summary["stats"]["overwritten"] == 1
+            assert PdfUpload.query.count() == 1
+
+    def test_parse_pdf_uploads_in_pool(self):
+        """複数のPDFをプロセスプールで解析し、アップロード順に結果が返ることをテスト"""
+        uploads = [("hash1", "a.pdf", b"%PDF-1.4 a"), ("hash2", "b.pdf", b"%PDF-1.4 b")]
+
+        results = parse_pdf_uploads_in_pool(uploads)
+
+        assert [result["filename"] for result in results] == ["a.pdf", "b.pdf"]
+        assert all(result["error"] for result in results)
+
+    def test_run_upload_job_records_summary(self, app):
+        """取込ジョブの結果がDBに記録されることをテスト"""
+        with app.app_context():
+            db.session.add(PosUploadJob(id="job1", status="queued"))
+            db.session.commit()
+
+            _run_upload_job(app, "job1", [], False, ["dup.pdf"], [])
+
+            job = db.session.get(PosUploadJob, "job1")
+            assert job.status == "finished"
+            assert job.summary["duplicate_files"] == ["dup.pdf"]
+            assert job.summary["uploaded_dates"] == []
+
+    def test_run_upload_job_missing_job(self, app):
+        """削除済みのジョブに結果を書き込まないことをテスト"""
+        with app.app_context():
+            _run_upload_job(app, "missing", [], False, [], [])
+
+            assert db.session.get(PosUploadJob, "missing") is None
+
 
 class TestPosRoutes:
     """POS機能のルーティングテスト"""
@@ -0,0 +1,190 @@
+"""
+予約機能のルートのテスト
+
+一覧表示などがクエリ数の上限（max_queries）内で動作することを確認する。
+"""
+
+from datetime import date
+import pytest
+from sqlalchemy import event
+from app import db
+from app.models import ExperienceProgram, Reservation
+from app.reservation import get_booked_participants, get_reservation_counts
+
+
+class TestReservationRoutes:
+    """予約ルートのテストクラス"""
+
+    def test_list_reservations(self, app, client):
+        """複数プログラムの予約一覧がN+1クエリにならずに表示されることをテスト"""
+        with app.app_context():
+            for i in range(3):
+                program = ExperienceProgram(
+                    name=f"テストプログラム{i}", description="テスト用", price=1000, capacity=10
+                )
+                db.session.add(program)
+                db.session.flush()
+                db.session.add(
+                    Reservation(
+                        program_id=program.id,
+                        name="山田 太郎",
+                        email="yamada@example.com",
+                        phone_number="090-1234-5678",
+                        reservation_date=date(2025, 12, 25),
+                        number_of_participants=2,
+                    )
+                )
+            db.session.commit()
+            db.session.expunge_all()
+
+        response = client.get("/reservations/list")
+        assert response.status_code == 200
+        html = response.get_data(as_text=True)
+        for i in range(3):
+            assert f"テストプログラム{i}" in html
+
+    def test_show_reservation(self, client, sample_reservation):
+        """予約詳細がプログラム情報と合わせて1回のクエリで表示されることをテスト"""
+        response = client.get(f"/reservations/show/{sample_reservation}")
+        assert response.status_code == 200
+        assert "テストプログラム" in response.get_data(as_text=True)
+
+    def test_api_events(self, client, sample_reservation):
+        """カレンダー用の予約データで日付がISO 8601形式で返ることをテスト"""
+        response = client.get("/reservations/api/events?start=2025-12-01&end=2025-12-31")
+        assert response.status_code == 200
+        assert response.mimetype == "application/json"
+        events = response.get_json()
+        assert len(events) == 1
+        assert events[0]["start"] == "2025-12-25"
+        assert events[0]["extendedProps"]["date"] == "2025-12-25"
+
+    def test_get_booked_participants(self, app, sample_reservation):
+        """予約済み参加人数がDB側で集計されることをテスト"""
+        with app.app_context():
+            reservation = db.session.get(Reservation, sample_reservation)
+            program_id = reservation.program_id
+            booked = reservation.number_of_participants
+
+            assert get_booked_participants(program_id, date(2025, 12, 25)) == booked
+            assert get_booked_participants(program_id, date(2025, 12, 25), exclude_id=sample_reservation) == 0
+            assert get_booked_participants(program_id, date(2025, 12, 26)) == 0
+
+    def test_program_cache_invalidated_on_create(self, app, client):
+        """体験プログラムの登録後に予約フォームの選択肢へ反映されることをテスト"""
+        assert "新しいプログラム" not in client.get("/reservations/create").get_data(as_text=True)
+        response = client.post(
+            "/programs/create",
+            data={"name": "新しいプログラム", "description": "説明", "price": 1000, "capacity": 5},
+        )
+        assert response.status_code == 302
+        assert "新しいプログラム" in client.get("/reservations/create").get_data(as_text=True)
+
+    def test_reservation_counts_prefetch_next_range(self, app, sample_reservation):
+        """翌期間の予約人数が先読みされ、クエリを発行せずに返されることをテスト"""
+        with app.app_context():
+            statements = []
+
+            def listener(conn, cursor, statement, *args):
+                statements.append(statement)
+
+            assert get_reservation_counts(date(2025, 11, 1), date(2025, 11, 30)) == {}
+
+            event.listen(db.engine, "before_cursor_execute", listener)
+            try:
+                counts = get_reservation_counts(date(2025, 12, 1), date(2025, 12, 27))
+            finally:
+                event.remove(db.engine, "before_cursor_execute", listener)
+
+            assert list(counts.values()) == [2]
+            assert statements == []
+
+    def test_delete_invalidates_reservation_counts(self, app, client, sample_reservation):
+        """予約の削除後にカレンダー用の集計が更新されることをテスト"""
+        url = "/reservations/api/events?start=2025-12-01&end=2025-12-31"
+        assert len(client.get(url).get_json()) == 1
+        client.post(f"/reservations/delete/{sample_reservation}")
+        assert client.get(url).get_json() == []
+
+    @pytest.mark.parametrize("participants, created", [(13, True), (14, False)])
+    def test_confirm_respects_capacity(self, app, client, sample_reservation, participants, created):
+        """予約確定時に定員（15名、既存予約2名）を超える予約が登録されないことをテスト"""
+        with app.app_context():
+            program_id = db.session.get(Reservation, sample_reservation).program_id
+        with client.session_transaction() as session:
+            session["reservation_data"] = {
+                "program_id": program_id,
+                "name": "佐藤 花子",
+                "email": "sato@example.com",
+                "phone_number": "090-0000-0000",
+                "reservation_date": "2025-12-25",
+                "number_of_participants": participants,
+            }
+
+        response = client.post("/reservations/confirm", data={"confirm": "1"})
+
+        with app.app_context():
+            assert get_booked_participants(program_id, date(2025, 12, 25)) == (2 + participants if created else 2)
+        if not created:
+            assert "残り: 13名" in response.get_data(as_text=True)
+
+    def test_edit_reservation(self, app, client, sample_reservation):
+        """予約の編集が関連の遅延ロードなしで行えることをテスト"""
+        with app.app_context():
+            program_id = db.session.get(Reservation, sample_reservation).program_id
+        response = client.post(
+            f"/reservations/edit/{sample_reservation}",
+            data={
+                "program_id": program_id,
+                "name": "山田 次郎",
+                "email": "yamada@example.com",
+                "phone_number": "090-1234-5678",
+                "reservation_date": "2099-01-10",
+                "number_of_participants": 3,
+            },
+        )
+        assert response.status_code == 302
+        with app.app_context():
+            assert db.session.get(Reservation, sample_reservation).name == "山田 次郎"
+
+    def test_delete_reservation(self, app, client, sample_reservation):
+        """予約がDELETE文1回で削除され、存在しない予約は404になることをテスト"""
+        response = client.post(f"/reservations/delete/{sample_reservation}")
+        assert response.status_code == 302
+        with app.app_context():
+            assert db.session.get(Reservation, sample_reservation) is None
+        assert client.post(f"/reservations/delete/{sample_reservation}").status_code == 404
+
+    def test_api_events_not_modified(self, client, sample_reservation):
+        """内容が変わっていない場合にETagで304が返ることをテスト"""
+        url = "/reservations/api/events?start=2025-12-01&end=2025-12-31"
+        etag = client.get(url).headers["ETag"]
+        response = client.get(url, headers={"If-None-Match": etag})
+        assert response.status_code == 304
+        assert response.get_data() == b""
+
+    def test_confirm_single_round_trip(self, app, client, sample_program):
+        """予約確定が定員チェックを含めてINSERT文1回で行われることをテスト"""
+        with client.session_transaction() as session:
+            session["reservation_data"] = {
+                "program_id": sample_program,
+                "name": "佐藤 花子",
+                "email": "sato@example.com",
+                "phone_number": "090-0000-0000",
+                "reservation_date": "2099-01-10",
+                "number_of_participants": 2,
+            }
+        statements = []
+
+        def listener(conn, cursor, statement, *args):
+            statements.append(statement)
+
+        event.listen(db.engine, "before_cursor_execute", listener)
+        try:
+            response = client.post("/reservations/confirm", data={"confirm": "1"})
+        finally:
+            event.remove(db.engine, "before_cursor_execute", listener)
+
+        assert response.status_code == 302
+        assert len(statements) == 1
+        assert statements[0].startswith("INSERT INTO reservations")
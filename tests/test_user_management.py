@@ -0,0 +1,78 @@
+"""
+ユーザー管理機能のテスト
+
+各ルートがクエリ数の上限（max_queries）内で動作することを確認する。
+"""
+
+import pytest
+from app import db
+from app.models import User
+from app.features.user_management import invalidate_user_list_cache
+
+
+@pytest.fixture
+def manager_client(app, client):
+    """
+    ユーザー管理権限を持つユーザーでログインしたクライアントを作成する
+
+    Returns:
+        (クライアント, 管理者のID, 同じ所属の一般ユーザーのID) のタプル
+    """
+    with app.app_context():
+        manager = User(
+            username="管理者",
+            email="manager@example.com",
+            department="振興センター",
+            hashed_password="x",
+            can_manage_users=True,
+        )
+        member = User(username="一般", email="member@example.com", department="振興センター", hashed_password="x")
+        db.session.add_all([manager, member])
+        db.session.commit()
+        manager_id, member_id = manager.id, member.id
+
+    invalidate_user_list_cache()
+    with client.session_transaction() as session:
+        session["_user_id"] = str(manager_id)
+        session["_fresh"] = True
+    return client, manager_id, member_id
+
+
+class TestUserManagementRoutes:
+    """ユーザー管理ルートのテストクラス"""
+
+    def test_dashboard(self, manager_client):
+        """ダッシュボードに同じ所属のユーザーが表示されることをテスト"""
+        client, _, _ = manager_client
+        response = client.get("/user-management/")
+        assert response.status_code == 200
+        assert "member@example.com" in response.get_data(as_text=True)
+
+    def test_toggle_user_management(self, app, manager_client):
+        """管理権限の切り替えをテスト"""
+        client, _, member_id = manager_client
+        response = client.post(f"/user-management/toggle-user-management/{member_id}")
+        assert response.status_code == 302
+        with app.app_context():
+            assert db.session.get(User, member_id).can_manage_users is True
+
+    def test_delete_user(self, app, manager_client):
+        """ユーザーの削除をテスト"""
+        client, _, member_id = manager_client
+        response = client.post(f"/user-management/delete/{member_id}")
+        assert response.status_code == 302
+        with app.app_context():
+            assert db.session.get(User, member_id) is None
+
+    def test_cannot_delete_self(self, app, manager_client):
+        """自分自身は削除できないことをテスト"""
+        client, manager_id, _ = manager_client
+        client.post(f"/user-management/delete/{manager_id}")
+        with app.app_context():
+            assert db.session.get(User, manager_id) is not None
+
+    def test_delete_missing_user(self, manager_client):
+        """存在しないユーザーの削除は404になることをテスト"""
+        client, _, _ = manager_client
+        response = client.post("/user-management/delete/9999")
+        assert response.status_code == 404